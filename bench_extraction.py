@@ -0,0 +1,93 @@
+"""
+Stress benchmark for skill/qualification extraction on long and adversarial bullets.
+
+Runs the default (regex LIST_PATTERNS) and bounded extraction modes over
+generated inputs of growing size and prints per-call latency, plus what the
+bounded mode truncated. Usage:
+
+    python bench_extraction.py [--sizes 1000 4000 16000] [--repeat 3]
+"""
+
+import argparse
+import statistics
+import time
+
+from skills_extractor import extract_skills_from_bullets
+from qualifications_extractor import extract_qualifications_from_bullets
+
+TYPICAL = [
+    "Experience with packet decoding and analysis tools such as tcpdump and Wireshark",
+    "Experience with public cloud networks, such as AWS, GCP, Azure",
+    "Bachelor's degree in Computer Science, Engineering, or a related field",
+    "Familiarity with Python, Prometheus, Grafana, ELK, GitHub is desirable",
+]
+
+
+def _repeat_to(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+# name -> builder(size) -> one bullet of roughly `size` chars
+CASES = {
+    "typical_prose": lambda n: _repeat_to(" ".join(TYPICAL) + " ", n),
+    "unpunctuated_in": lambda n: _repeat_to("experience in systems in trading in research ", n),
+    "unclosed_parens": lambda n: _repeat_to("(C++ ", n),
+    "whitespace_run": lambda n: "such as" + " " * n + "x",
+    "trigger_flood": lambda n: _repeat_to("such as including e.g. ", n),
+    "html_blob": lambda n: _repeat_to(
+        '<div class="job"><span>Python</span> (<b>Linux</b>, such as <i>Rust</i> in prod) ', n
+    ),
+}
+
+EXTRACTORS = {
+    "skills": extract_skills_from_bullets,
+    "qualifications": extract_qualifications_from_bullets,
+}
+
+
+def _time_call(fn, bullets, repeat: int, **kwargs) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(bullets, **kwargs)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(sizes: list[int], repeat: int, max_chars: int, max_seconds: float, legacy_limit: int) -> None:
+    print(f"{'extractor':<15} {'case':<16} {'size':>7} {'default ms':>11} {'bounded ms':>11}  truncations")
+    for ex_name, fn in EXTRACTORS.items():
+        for case, build in CASES.items():
+            for size in sizes:
+                bullets = [build(size)]
+                if size <= legacy_limit:
+                    legacy = f"{statistics.median(_time_call(fn, bullets, repeat)) * 1e3:11.2f}"
+                else:
+                    legacy = f"{'skipped':>11}"
+                truncations: list[dict] = []
+                bounded_times = _time_call(
+                    fn, bullets, repeat,
+                    bounded=True,
+                    max_bullet_chars=max_chars,
+                    max_bullet_seconds=max_seconds,
+                    truncations=truncations,
+                )
+                reasons = sorted({t["reason"] for t in truncations})
+                print(
+                    f"{ex_name:<15} {case:<16} {size:>7} {legacy} "
+                    f"{statistics.median(bounded_times) * 1e3:11.2f}  {','.join(reasons) or '-'}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 4_000, 16_000, 64_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-chars", type=int, default=2_000)
+    parser.add_argument("--max-seconds", type=float, default=0.05)
+    parser.add_argument(
+        "--legacy-limit", type=int, default=16_000,
+        help="skip the default mode above this size (it is quadratic on some cases)",
+    )
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.max_chars, args.max_seconds, args.legacy_limit)
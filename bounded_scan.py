@@ -0,0 +1,141 @@
+"""
+Linear-time list-phrase scanning and per-bullet budgets for the extractors.
+
+The LIST_PATTERNS in skills_extractor / qualifications_extractor are lazy
+regex scans (e.g. ``\\(([^)]+)\\)`` or ``\\bin\\s+([^.]+?)(?:\\.|$)``). Python's
+backtracking engine retries them from every candidate start, so a long
+bullet full of unclosed "(" or whitespace runs costs quadratic time.
+
+The helpers here give the same phrases with forward-only scans: triggers are
+fixed-width regexes (no unbounded quantifiers), and each phrase is cut with
+str.find, resuming after the terminator so no character is scanned twice.
+"""
+
+import re
+import time
+from typing import Iterator, Sequence
+
+DEFAULT_MAX_BULLET_CHARS = 2000
+DEFAULT_MAX_BULLET_SECONDS = 0.05
+
+# Sentinel in a trigger list for "(...)" phrases
+PARENTHESES = "("
+
+
+def collapse_whitespace(text: str) -> str:
+    """Collapse whitespace runs to one space so later \\s+ splits stay linear."""
+    return " ".join(text.split())
+
+
+def iter_trigger_phrases(text: str, trigger: re.Pattern) -> Iterator[str]:
+    """
+    Yield the text after each `trigger` match up to the next "." (or the end),
+    like finditer over ``trigger([^.]+?)(?:\\.|$)``. Matches don't overlap.
+    """
+    pos = 0
+    n = len(text)
+    while pos <= n:
+        m = trigger.search(text, pos)
+        if not m:
+            return
+        start = m.end()
+        stop = text.find(".", start)
+        if stop == -1:
+            stop = n
+        if stop == start:
+            pos = start + 1
+            continue
+        yield text[start:stop]
+        pos = stop + 1
+
+
+def iter_paren_phrases(text: str) -> Iterator[str]:
+    """Yield the contents of each "(...)", like finditer over ``\\(([^)]+)\\)``."""
+    pos = 0
+    while True:
+        open_ = text.find("(", pos)
+        if open_ == -1:
+            return
+        close = text.find(")", open_ + 1)
+        if close == -1:
+            # No ")" left, so no later "(" can close either
+            return
+        if close == open_ + 1:
+            pos = close
+            continue
+        yield text[open_ + 1:close]
+        pos = close + 1
+
+
+def iter_list_phrases(text: str, triggers: Sequence[re.Pattern | str]) -> Iterator[str]:
+    """Run each trigger (or PARENTHESES) over text in turn, yielding stripped phrases."""
+    for trigger in triggers:
+        if trigger == PARENTHESES:
+            phrases = iter_paren_phrases(text)
+        else:
+            phrases = iter_trigger_phrases(text, trigger)
+        for phrase in phrases:
+            yield phrase.strip()
+
+
+# ---------------------------------------------------------------------------
+# Per-bullet budget
+# ---------------------------------------------------------------------------
+
+class BulletBudget:
+    """
+    Length and wall-clock budget applied to each bullet in bounded mode.
+
+    Anything cut short is appended to `truncations` as
+    {"bullet": index, "length": original length, "reason": "length" | "time",
+     "kept": chars kept (length) or None, "stage": stage name (time) or None}.
+    """
+
+    def __init__(
+        self,
+        max_chars: int = DEFAULT_MAX_BULLET_CHARS,
+        max_seconds: float = DEFAULT_MAX_BULLET_SECONDS,
+        truncations: list[dict] | None = None,
+    ):
+        self.max_chars = max_chars
+        self.max_seconds = max_seconds
+        self.truncations = truncations if truncations is not None else []
+        self._index = -1
+        self._length = 0
+        self._deadline = 0.0
+        self._expired = False
+
+    def start(self, index: int, bullet: str) -> str:
+        """Begin a bullet: normalize whitespace, clip to max_chars, start the clock."""
+        self._index = index
+        self._length = len(bullet)
+        self._expired = False
+        text = collapse_whitespace(bullet)
+        if self.max_chars and len(text) > self.max_chars:
+            cut = text.rfind(" ", 0, self.max_chars + 1)
+            text = text[:cut if cut > 0 else self.max_chars]
+            self.truncations.append({
+                "bullet": index,
+                "length": self._length,
+                "reason": "length",
+                "kept": len(text),
+                "stage": None,
+            })
+        self._deadline = time.perf_counter() + self.max_seconds
+        return text
+
+    def expired(self, stage: str) -> bool:
+        """True once the current bullet is over time; reported once per bullet."""
+        if self._expired:
+            return True
+        if not self.max_seconds or time.perf_counter() <= self._deadline:
+            return False
+        self._expired = True
+        self.truncations.append({
+            "bullet": self._index,
+            "length": self._length,
+            "reason": "time",
+            "kept": None,
+            "stage": stage,
+        })
+        return True
@@ -0,0 +1,230 @@
+"""
+Canonical term vocabulary and alias trie shared by the extractors.
+
+Every lexicon term and known alias ("Unix/Linux", "B.S.", "Google Cloud")
+maps to one canonical term with a fixed integer id (its VOCABULARY
+position). TermTrie.scan() finds all lexicon hits in a bullet in one
+left-to-right pass (longest match at each word start), replacing one regex
+search per lexicon entry.
+
+is_fragment() rejects list-pattern tokens that are sentence pieces rather
+than terms, so they don't leak into job_skills.csv.
+"""
+
+import re
+from typing import Callable, Iterable
+
+# ---------------------------------------------------------------------------
+# Aliases: canonical term -> surface forms that mean the same thing
+# ---------------------------------------------------------------------------
+
+ALIASES = {
+    # Platforms / tech
+    "Linux": {"Unix", "Unix/Linux", "Linux/Unix", "Unix-like", "*nix", "GNU/Linux"},
+    "GCP": {"Google Cloud", "Google Cloud Platform"},
+    "AWS": {"Amazon Web Services"},
+    "Azure": {"Microsoft Azure"},
+    "C++": {"Cpp", "C plus plus"},
+    "Go": {"Golang"},
+    "CI/CD": {"CI / CD", "CICD", "continuous integration"},
+    "Git": {"git-based"},
+    "NX-OS": {"NXOS"},
+    # Degrees
+    "Bachelor's": {"Bachelors", "Bachelor", "BS", "B.S.", "BA", "B.A.", "BSc", "B.Sc.", "undergraduate degree"},
+    "Master's": {"Masters", "Master", "MS", "M.S.", "MA", "M.A.", "MSc", "MSc.", "M.Sc."},
+    "PhD": {"Ph.D.", "Ph.D", "Doctorate", "doctoral degree"},
+    "MBA": {"M.B.A."},
+    # Fields
+    "Electrical Engineering": {"EE"},
+    "Computer Science": {"CS", "comp sci"},
+    "Related field": {"related fields", "a related field", "or a related field"},
+    # Soft skills
+    "collaboration": {"collaborate", "collaborative", "teamwork"},
+    "communication": {"communicate", "communicator"},
+    "problem solving": {"problem-solving", "problem solver"},
+    "self-starter": {"self starter"},
+    # Work arrangement
+    "remote": {"work from home", "WFH"},
+    "on-site": {"in-office", "in-person", "onsite", "on site"},
+}
+
+# ---------------------------------------------------------------------------
+# Vocabulary: canonical term <-> integer id
+#
+# A term's id is its position in VOCABULARY. The ids are persisted (terms.csv,
+# term_id columns of the columnar partitions), so the list is append-only:
+# never reorder or remove entries, and add new lexicon terms at the end.
+# ---------------------------------------------------------------------------
+
+VOCABULARY = [
+    "analytical", "Ansible", "Arista", "attention to detail", "AWS", "Azure",
+    "Bachelor's", "Bash", "BGP", "C", "C++", "CI/CD", "Cisco", "collaboration",
+    "communication", "Computer Engineering", "Computer Science", "core dump", "Cumulus",
+    "Data Science", "distributed", "DNS", "documentation", "Electrical Engineering",
+    "ELK", "Engineering", "EOS", "explain", "filesystem", "flexible", "GCP", "Git",
+    "GitHub", "Go", "Grafana", "HTTP", "HTTPS", "hybrid", "IGMP", "Java", "JavaScript",
+    "Jira", "Juniper", "kernel", "LACP", "leadership", "Linux", "LLDP", "Lustre",
+    "Master's", "Mathematics", "MBA", "mentoring", "MLAG", "motivated", "multitasking",
+    "Nvidia", "NX-OS", "on-site", "organizational skills", "OSPF", "packages", "pcap",
+    "PhD", "Physics", "PIM", "prioritization", "problem solving", "Prometheus",
+    "Python", "Related field", "remote", "RoCEv2", "RSTP", "Rust", "Salt",
+    "self-starter", "Shell", "SNMP", "SONiC", "SQL", "stakeholder", "Statistics",
+    "STEM", "STP", "TCP", "tcpdump", "technical writing", "time management",
+    "TypeScript", "UDP", "upstream", "verbal communication", "VXLAN", "Wireshark",
+    "work independently", "written communication",
+]
+
+TERMS: list[str] = list(VOCABULARY)
+_IDS: dict[str, int] = {t.lower(): i for i, t in enumerate(TERMS)}
+_CANONICAL: dict[str, str] = {}
+
+for _canonical, _aliases in ALIASES.items():
+    for _a in _aliases | {_canonical}:
+        _CANONICAL[_a.lower()] = _canonical
+
+
+def canonical(term: str) -> str:
+    """Canonical spelling of a term (the term itself if it has no alias)."""
+    s = term.strip()
+    return _CANONICAL.get(s.lower(), s)
+
+
+def term_id(term: str) -> int | None:
+    """Id of a vocabulary term or alias, else None."""
+    return _IDS.get(canonical(term).lower())
+
+
+def vocabulary_rows() -> list[dict]:
+    """The vocabulary as {"term_id", "term"} rows (for terms.csv)."""
+    return [{"term_id": i, "term": t} for i, t in enumerate(TERMS)]
+
+
+# ---------------------------------------------------------------------------
+# Trie
+# ---------------------------------------------------------------------------
+
+_END = ""  # key holding the term id on a terminal node (real keys are 1 char)
+
+
+class TermTrie:
+    """Character trie over lowercased surface forms -> canonical term id."""
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._root: dict = {}
+        for t in terms:
+            self.add_term(t)
+
+    def add(self, surface: str, tid: int) -> None:
+        node = self._root
+        for ch in surface.lower():
+            node = node.setdefault(ch, {})
+        node[_END] = tid
+
+    def add_term(self, term: str) -> int:
+        """Add a lexicon term plus every alias of its canonical form; return its id."""
+        c = canonical(term)
+        tid = term_id(c)
+        if tid is None:
+            raise KeyError(f"{c!r} is not in canonical_terms.VOCABULARY; append it there")
+        for surface in ALIASES.get(c, set()) | {c, term.strip()}:
+            self.add(surface, tid)
+        return tid
+
+    def get(self, surface: str) -> int | None:
+        node = self._root
+        for ch in surface.strip().lower():
+            node = node.get(ch)
+            if node is None:
+                return None
+        return node.get(_END)
+
+    def scan(self, text: str, stop: Callable[[], bool] | None = None) -> list[tuple[int, int, int]]:
+        """
+        Non-overlapping (start, end, term id) hits, longest match first,
+        starting and ending on word boundaries. O(len(text) * max term length).
+        stop (e.g. a BulletBudget check) is polled every 256 characters; the
+        scan returns the hits so far once it answers True.
+        """
+        hits = []
+        n = len(text)
+        i = 0
+        next_poll = 256
+        while i < n:
+            if stop and i >= next_poll:
+                if stop():
+                    break
+                next_poll = i + 256
+            if i and text[i - 1].isalnum():
+                i += 1
+                continue
+            node = self._root
+            best = None
+            j = i
+            while j < n:
+                node = node.get(text[j].lower())
+                if node is None:
+                    break
+                j += 1
+                if _END in node and (j == n or not (text[j - 1].isalnum() and text[j].isalnum())):
+                    best = (j, node[_END])
+            if best:
+                hits.append((i, best[0], best[1]))
+                i = best[0]
+            else:
+                i += 1
+        return hits
+
+
+# ---------------------------------------------------------------------------
+# Fragment filter for list-pattern tokens
+# ---------------------------------------------------------------------------
+
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "be", "to", "for", "with", "in", "of", "on",
+    "at", "as", "by", "from", "our", "you", "your", "we", "will", "can", "should",
+    "must", "have", "has", "this", "that", "these", "who", "which", "etc",
+}
+
+_LEADING_NOISE = {
+    "experience", "knowledge", "ability", "understanding", "familiarity", "strong",
+    "excellent", "proven", "deep", "solid", "good", "working", "proficiency",
+}
+
+# Words that introduce list items ("including X", "such as X", "e.g. X")
+_LIST_LEADS = {
+    "including", "include", "includes", "such", "e.g", "e.g.", "eg", "i.e", "i.e.",
+    "like", "especially", "particularly",
+}
+
+# Requirement qualifiers that end up as list items ("Python, Go, desirable")
+_QUALIFIERS = {
+    "desirable", "desired", "preferred", "required", "plus", "bonus", "optional",
+    "ideally", "preferably", "nice-to-have", "helpful", "beneficial", "advantageous",
+}
+
+_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+
+_WORD = re.compile(r"[A-Za-z0-9+#/.\-']+")
+
+
+def is_fragment(token: str, max_words: int = 4, max_chars: int = 40) -> bool:
+    """
+    True if an unknown list-pattern token looks like a sentence piece rather
+    than a term: too long, has stopwords or unbalanced brackets ("CI/CD (Jenkins"),
+    opens with a qualifier ("strong ...") or list lead ("including ..."), is a
+    requirement word ("desirable") or has no letters.
+    """
+    t = token.strip()
+    if not t or len(t) > max_chars or not any(c.isalpha() for c in t):
+        return True
+    if t[0] in ".,;:-" or t[-1] in ",;:-":
+        return True
+    if any(t.count(o) != t.count(c) for o, c in _BRACKETS.items()):
+        return True
+    words = _WORD.findall(t)
+    if not words or len(words) > max_words:
+        return True
+    lowered = [w.lower() for w in words]
+    if any(w in _STOPWORDS or w in _QUALIFIERS for w in lowered):
+        return True
+    return lowered[0] in _LEADING_NOISE or lowered[0] in _LIST_LEADS
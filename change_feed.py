@@ -0,0 +1,189 @@
+"""
+Change feed of added, removed and modified postings between crawls.
+
+Keeps one small fingerprint file per company (data/fingerprints/<company>.json:
+url -> posting digest + tracked field values). After a crawl, only the
+crawled companies' files are read and rewritten, so a diff costs time
+proportional to those companies' postings, not the whole archive. Changes are
+appended to data/changes.jsonl, one JSON event per line:
+
+    {"run": "...", "company": "hrt", "type": "added" | "modified",
+     "url": "...", "job_id": 12, "title": "...", "changes": {field: diff}}
+    {"run": "...", "company": "hrt", "type": "removed", "url": "...",
+     "title": "...", "last_seen": {"run": "...", "job_id": 7}}
+
+job_id is the posting's row in this run's jobs table. Ids are renumbered every
+run, so a removed posting only carries the id it had in the run it was last
+seen in. For modified postings, `changes` holds only the fields that differ:
+{"old", "new"} for scalar fields, {"added", "removed"} for term lists, and
+{"old_digest", "new_digest"} for long text.
+
+A posting counts as modified only when its source content (SOURCE_FIELDS)
+changes. Extracted term lists are diffed alongside such a change but never
+trigger one: a vocabulary or extractor change, or a bullet clipped by the
+bounded-mode time budget, changes them without the posting changing.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+# Short fields stored and diffed by value
+VALUE_FIELDS = ["title", "meta", "location", "country", "category", "job_type"]
+# Extraction tables diffed as sets of terms: field -> (table, column)
+TERM_FIELDS = {
+    "skills": ("job_skills", "skill"),
+    "qualifications": ("job_qualifications", "qualification"),
+}
+# Long text stored only as a digest
+DIGEST_FIELDS = ["description"]
+# Fields the posting fingerprint covers: what was crawled, not what was extracted
+SOURCE_FIELDS = VALUE_FIELDS + DIGEST_FIELDS
+
+
+def _digest(value) -> str:
+    data = value if isinstance(value, str) else json.dumps(value, sort_keys=True)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def fingerprint(fields: dict) -> str:
+    """Digest of a posting's source content (SOURCE_FIELDS)."""
+    return _digest({f: fields.get(f) for f in SOURCE_FIELDS})
+
+
+def posting_fields(job: dict, row: dict, terms: dict[str, list[str]]) -> dict:
+    """Tracked fields of one posting: its jobs-table row, extracted terms, and digests."""
+    fields = {f: row.get(f, "") for f in VALUE_FIELDS}
+    fields.update({f: sorted(terms.get(f, [])) for f in TERM_FIELDS})
+    fields.update({f: _digest(job.get(f) or "") for f in DIGEST_FIELDS})
+    return fields
+
+
+def _field_changes(old: dict, new: dict) -> dict:
+    changes = {}
+    for f in VALUE_FIELDS:
+        if old.get(f) != new.get(f):
+            changes[f] = {"old": old.get(f), "new": new.get(f)}
+    for f in TERM_FIELDS:
+        before, after = set(old.get(f) or []), set(new.get(f) or [])
+        if before != after:
+            changes[f] = {"added": sorted(after - before), "removed": sorted(before - after)}
+    for f in DIGEST_FIELDS:
+        if old.get(f) != new.get(f):
+            changes[f] = {"old_digest": old.get(f), "new_digest": new.get(f)}
+    return changes
+
+
+class FingerprintStore:
+    """Per-company posting fingerprints on disk."""
+
+    def __init__(self, index_dir: str = "data/fingerprints"):
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+
+    def _path(self, company: str) -> str:
+        return os.path.join(self.index_dir, f"{company}.json")
+
+    def load(self, company: str) -> dict[str, dict]:
+        try:
+            with open(self._path(company), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, company: str, postings: dict[str, dict]) -> None:
+        tmp = self._path(company) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(postings, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self._path(company))
+
+
+def diff_company(
+    company: str,
+    current: dict[str, dict],
+    previous: dict[str, dict],
+    run: str,
+) -> list[dict]:
+    """
+    Events for one company. `current` / `previous` map url -> entry with
+    "fp", "run", "job_id" and "fields" (as built by emit_change_feed).
+    """
+    events = []
+
+    def event(kind: str, url: str, entry: dict, changes: dict | None = None) -> dict:
+        e = {"run": run, "company": company, "type": kind, "url": url}
+        if kind == "removed":
+            e["title"] = entry["fields"].get("title")
+            e["last_seen"] = {"run": entry.get("run"), "job_id": entry.get("job_id")}
+        else:
+            e["job_id"] = entry.get("job_id")
+            e["title"] = entry["fields"].get("title")
+        if changes is not None:
+            e["changes"] = changes
+        return e
+
+    for url, entry in current.items():
+        old = previous.get(url)
+        if old is None:
+            events.append(event("added", url, entry))
+        elif old["fp"] != entry["fp"]:
+            events.append(event("modified", url, entry, _field_changes(old["fields"], entry["fields"])))
+    for url, old in previous.items():
+        if url not in current:
+            events.append(event("removed", url, old))
+    return events
+
+
+def emit_change_feed(
+    jobs: list[dict],
+    tables: dict[str, list[dict]],
+    crawled: list[str] | None = None,
+    index_dir: str = "data/fingerprints",
+    feed_path: str = "data/changes.jsonl",
+    run: str | None = None,
+) -> list[dict]:
+    """
+    Diff this crawl against the stored fingerprints and append the events to
+    feed_path. `jobs` and tables["jobs"] are in the same order (see
+    jobs_cursor.build_tables). `crawled` lists the company slugs whose crawl
+    is complete (see Company.crawl_complete; default: every company with
+    jobs). Only those are diffed; other companies keep their fingerprints
+    untouched. A company with no jobs this run is skipped too, since an empty
+    crawl is far more likely a failure than a board with no postings.
+    Returns the events.
+    """
+    run = run or datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    terms_by_job: dict[int, dict[str, list[str]]] = {}
+    for field, (table, column) in TERM_FIELDS.items():
+        for r in tables.get(table, []):
+            terms_by_job.setdefault(r["job_id"], {}).setdefault(field, []).append(r[column])
+
+    current: dict[str, dict[str, dict]] = {}
+    for job, row in zip(jobs, tables["jobs"]):
+        if crawled is not None and row["company"] not in crawled:
+            continue
+        fields = posting_fields(job, row, terms_by_job.get(row["id"], {}))
+        current.setdefault(row["company"], {})[row["url"]] = {
+            "fp": fingerprint(fields),
+            "run": run,
+            "job_id": row["id"],
+            "fields": fields,
+        }
+
+    store = FingerprintStore(index_dir)
+    events = []
+    for company in crawled if crawled is not None else list(current):
+        postings = current.get(company)
+        if not postings:
+            print(f"[{company}] no postings this run; change feed skipped")
+            continue
+        events.extend(diff_company(company, postings, store.load(company), run))
+        store.save(company, postings)
+
+    if events:
+        with open(feed_path, "a", encoding="utf-8") as f:
+            for e in events:
+                f.write(json.dumps(e) + "\n")
+    return events
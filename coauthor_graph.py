@@ -0,0 +1,350 @@
+"""
+Co-authorship graph over OpenAlex works, for lead discovery.
+
+Authors and institutions get dense integer ids. Author-author edges (weight =
+number of shared works) are kept in CSR form as .npy files that are opened
+memory-mapped, so a neighbourhood lookup is a slice and nothing is loaded up
+front. New works are appended to a small edge log and merged into the CSR
+arrays by compact().
+
+On-disk layout (graph_dir):
+    authors.csv, institutions.csv   id, openalex_id, name (append-only)
+    works.txt                       ingested work ids (append-only)
+    indptr.npy / indices.npy / weights.npy             author -> co-authors
+    affil_indptr.npy / affil_indices.npy               author -> institutions
+    edges.log / affils.log          int32 rows not yet compacted
+
+    graph = CoauthorGraph("data/graph")
+    graph.ingest_works(iter_topic_works(["T10054"]))
+    graph.compact()
+    graph.top_collaborators(graph.author_id("A5023888391"))
+"""
+
+import csv
+import os
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+# Works with more authors than this (consortium papers) add no pairwise edges;
+# k authors would otherwise cost k^2 edges and connect everyone to everyone.
+MAX_AUTHORS_PER_WORK = 50
+
+_EDGE_DTYPE = np.dtype([("a", "<i4"), ("b", "<i4"), ("w", "<i4")])
+_AFFIL_DTYPE = np.dtype([("a", "<i4"), ("i", "<i4")])
+
+
+def _short_id(openalex_id: str) -> str:
+    return (openalex_id or "").rsplit("/", 1)[-1]
+
+
+class _IdMap:
+    """openalex id <-> dense int id, persisted as an append-only CSV."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.ids: dict[str, int] = {}
+        self.keys: list[str] = []
+        self.names: list[str] = []
+        if os.path.exists(path):
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self.ids[row["openalex_id"]] = int(row["id"])
+                    self.keys.append(row["openalex_id"])
+                    self.names.append(row["name"])
+        self._new: list[dict] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def intern(self, key: str, name: str = "") -> int:
+        i = self.ids.get(key)
+        if i is None:
+            i = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.names.append(name)
+            self._new.append({"id": i, "openalex_id": key, "name": name})
+        return i
+
+    def flush(self) -> None:
+        if not self._new:
+            return
+        exists = os.path.exists(self.path)
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["id", "openalex_id", "name"])
+            if not exists:
+                writer.writeheader()
+            writer.writerows(self._new)
+        self._new = []
+
+
+class CoauthorGraph:
+    def __init__(self, graph_dir: str = "data/graph"):
+        self.graph_dir = graph_dir
+        os.makedirs(graph_dir, exist_ok=True)
+        self.authors = _IdMap(self._path("authors.csv"))
+        self.institutions = _IdMap(self._path("institutions.csv"))
+
+        works_path = self._path("works.txt")
+        self.works: set[str] = set()
+        if os.path.exists(works_path):
+            with open(works_path, encoding="utf-8") as f:
+                self.works = {line.strip() for line in f if line.strip()}
+
+        self._load_csr()
+        self._load_logs()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.graph_dir, name)
+
+    # -- storage ------------------------------------------------------------
+
+    def _load(self, name: str, dtype) -> np.ndarray:
+        path = self._path(name)
+        if not os.path.exists(path):
+            return np.zeros(1 if "indptr" in name else 0, dtype=dtype)
+        return np.load(path, mmap_mode="r")
+
+    def _load_csr(self) -> None:
+        self.indptr = self._load("indptr.npy", np.int64)
+        self.indices = self._load("indices.npy", np.int32)
+        self.weights = self._load("weights.npy", np.int32)
+        self.affil_indptr = self._load("affil_indptr.npy", np.int64)
+        self.affil_indices = self._load("affil_indices.npy", np.int32)
+
+    def _load_logs(self) -> None:
+        # Pending (uncompacted) rows, indexed in memory; kept small by compact()
+        self._pending: dict[int, dict[int, int]] = {}
+        self._pending_affils: dict[int, set[int]] = {}
+        if os.path.exists(self._path("edges.log")):
+            for a, b, w in np.fromfile(self._path("edges.log"), dtype=_EDGE_DTYPE):
+                self._add_pending(int(a), int(b), int(w))
+        if os.path.exists(self._path("affils.log")):
+            for a, i in np.fromfile(self._path("affils.log"), dtype=_AFFIL_DTYPE):
+                self._pending_affils.setdefault(int(a), set()).add(int(i))
+
+    def _add_pending(self, a: int, b: int, w: int) -> None:
+        for x, y in ((a, b), (b, a)):
+            row = self._pending.setdefault(x, {})
+            row[y] = row.get(y, 0) + w
+
+    @staticmethod
+    def _save(path: str, arr: np.ndarray) -> None:
+        tmp = path + ".tmp.npy"
+        np.save(tmp, arr)
+        os.replace(tmp, path)
+
+    # -- ingestion ----------------------------------------------------------
+
+    def ingest_works(self, works: Iterable[dict]) -> int:
+        """
+        Add co-author edges and affiliations from OpenAlex work dicts (as
+        returned by openalex.iter_works). Works already ingested are skipped.
+        Returns the number of new works.
+        """
+        edges: dict[tuple[int, int], int] = {}
+        affils: set[tuple[int, int]] = set()
+        new_works = []
+
+        for work in works:
+            wid = _short_id(work.get("id"))
+            if not wid or wid in self.works:
+                continue
+            self.works.add(wid)
+            new_works.append(wid)
+
+            author_ids = []
+            for authorship in work.get("authorships") or []:
+                author = authorship.get("author") or {}
+                if not author.get("id"):
+                    continue
+                aid = self.authors.intern(_short_id(author["id"]), author.get("display_name") or "")
+                author_ids.append(aid)
+                for inst in authorship.get("institutions") or []:
+                    if inst.get("id"):
+                        iid = self.institutions.intern(_short_id(inst["id"]), inst.get("display_name") or "")
+                        affils.add((aid, iid))
+
+            author_ids = sorted(set(author_ids))
+            if len(author_ids) > MAX_AUTHORS_PER_WORK:
+                continue
+            for x in range(len(author_ids)):
+                for y in range(x + 1, len(author_ids)):
+                    key = (author_ids[x], author_ids[y])
+                    edges[key] = edges.get(key, 0) + 1
+
+        if edges:
+            rows = np.array([(a, b, w) for (a, b), w in edges.items()], dtype=_EDGE_DTYPE)
+            with open(self._path("edges.log"), "ab") as f:
+                rows.tofile(f)
+            for (a, b), w in edges.items():
+                self._add_pending(a, b, w)
+        if affils:
+            rows = np.array(sorted(affils), dtype=_AFFIL_DTYPE)
+            with open(self._path("affils.log"), "ab") as f:
+                rows.tofile(f)
+            for a, i in affils:
+                self._pending_affils.setdefault(a, set()).add(i)
+
+        self.authors.flush()
+        self.institutions.flush()
+        if new_works:
+            with open(self._path("works.txt"), "a", encoding="utf-8") as f:
+                f.write("\n".join(new_works) + "\n")
+        return len(new_works)
+
+    def compact(self) -> None:
+        """Merge the edge/affiliation logs into the CSR arrays and clear the logs."""
+        n = len(self.authors)
+
+        src, dst, w = self._csr_coo(self.indptr, self.indices, self.weights)
+        if self._pending:
+            p_src = np.fromiter((a for a, row in self._pending.items() for _ in row), dtype=np.int32)
+            p_dst = np.fromiter((b for row in self._pending.values() for b in row), dtype=np.int32)
+            p_w = np.fromiter((x for row in self._pending.values() for x in row.values()), dtype=np.int32)
+            src, dst, w = np.concatenate([src, p_src]), np.concatenate([dst, p_dst]), np.concatenate([w, p_w])
+        indptr, indices, weights = self._coo_to_csr(n, src, dst, w)
+
+        a_src, a_dst, _ = self._csr_coo(self.affil_indptr, self.affil_indices, None)
+        if self._pending_affils:
+            p_src = np.fromiter((a for a, s in self._pending_affils.items() for _ in s), dtype=np.int32)
+            p_dst = np.fromiter((i for s in self._pending_affils.values() for i in s), dtype=np.int32)
+            a_src, a_dst = np.concatenate([a_src, p_src]), np.concatenate([a_dst, p_dst])
+        affil_indptr, affil_indices, _ = self._coo_to_csr(n, a_src, a_dst, None)
+
+        # Release the memory maps before replacing the files they map
+        self.indptr = self.indices = self.weights = None
+        self.affil_indptr = self.affil_indices = None
+        self._save(self._path("indptr.npy"), indptr)
+        self._save(self._path("indices.npy"), indices)
+        self._save(self._path("weights.npy"), weights)
+        self._save(self._path("affil_indptr.npy"), affil_indptr)
+        self._save(self._path("affil_indices.npy"), affil_indices)
+        for log in ("edges.log", "affils.log"):
+            if os.path.exists(self._path(log)):
+                os.remove(self._path(log))
+
+        self._load_csr()
+        self._pending = {}
+        self._pending_affils = {}
+
+    @staticmethod
+    def _csr_coo(indptr, indices, weights):
+        counts = np.diff(np.asarray(indptr))
+        src = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+        dst = np.asarray(indices, dtype=np.int32)
+        w = np.asarray(weights, dtype=np.int32) if weights is not None else np.ones(len(dst), dtype=np.int32)
+        return src, dst, w
+
+    @staticmethod
+    def _coo_to_csr(n: int, src, dst, w):
+        """Sort (src, dst), sum duplicate pairs, and build indptr for n rows."""
+        order = np.lexsort((dst, src))
+        src, dst = src[order], dst[order]
+        w = w[order] if w is not None else None
+        if len(src):
+            first = np.ones(len(src), dtype=bool)
+            first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+            starts = np.flatnonzero(first)
+            if w is not None:
+                w = np.add.reduceat(w, starts).astype(np.int32)
+            src, dst = src[starts], dst[starts]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return indptr, dst.astype(np.int32), w
+
+    # -- lookups ------------------------------------------------------------
+
+    def author_id(self, openalex_id: str) -> int | None:
+        return self.authors.ids.get(_short_id(openalex_id))
+
+    def author(self, aid: int) -> dict:
+        return {"id": aid, "openalex_id": self.authors.keys[aid], "name": self.authors.names[aid]}
+
+    def neighbors(self, aid: int) -> dict[int, int]:
+        """{co-author id: shared works} for one author."""
+        result: dict[int, int] = {}
+        if aid + 1 < len(self.indptr):
+            start, end = self.indptr[aid], self.indptr[aid + 1]
+            result = dict(zip(self.indices[start:end].tolist(), self.weights[start:end].tolist()))
+        for b, w in self._pending.get(aid, {}).items():
+            result[b] = result.get(b, 0) + w
+        return result
+
+    def institutions_of(self, aid: int) -> list[int]:
+        found = set()
+        if aid + 1 < len(self.affil_indptr):
+            found.update(self.affil_indices[self.affil_indptr[aid]:self.affil_indptr[aid + 1]].tolist())
+        found |= self._pending_affils.get(aid, set())
+        return sorted(found)
+
+    # -- queries ------------------------------------------------------------
+
+    def top_collaborators(self, aid: int, n: int = 10) -> list[tuple[int, int]]:
+        """(co-author id, shared works) pairs, most shared works first."""
+        return sorted(self.neighbors(aid).items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+    def k_hop(self, aid: int, k: int = 2, limit: int | None = None) -> dict[int, int]:
+        """{author id: hop distance} for everyone within k hops (excluding aid)."""
+        dist = {aid: 0}
+        frontier = [aid]
+        for hop in range(1, k + 1):
+            nxt = []
+            for node in frontier:
+                for b in self.neighbors(node):
+                    if b not in dist:
+                        dist[b] = hop
+                        nxt.append(b)
+                        if limit and len(dist) > limit:
+                            del dist[aid]
+                            return dist
+            frontier = nxt
+        del dist[aid]
+        return dist
+
+    def shortest_path(self, source: int, target: int, max_hops: int = 6) -> list[int] | None:
+        """Shortest intro chain source -> ... -> target (bidirectional BFS), or None."""
+        if source == target:
+            return [source]
+        parents = [{source: None}, {target: None}]
+        frontiers = [deque([source]), deque([target])]
+        for _ in range(max_hops):
+            # Expand the smaller side
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            other = 1 - side
+            for _ in range(len(frontiers[side])):
+                node = frontiers[side].popleft()
+                for b in self.neighbors(node):
+                    if b in parents[side]:
+                        continue
+                    parents[side][b] = node
+                    if b in parents[other]:
+                        return self._join(parents, b)
+                    frontiers[side].append(b)
+            if not frontiers[side]:
+                return None
+        return None
+
+    @staticmethod
+    def _join(parents: list[dict], meet: int) -> list[int]:
+        halves = []
+        for p in parents:
+            chain, node = [], meet
+            while node is not None:
+                chain.append(node)
+                node = p[node]
+            halves.append(chain)
+        forward, backward = halves
+        return forward[::-1] + backward[1:]
+
+
+if __name__ == "__main__":
+    import sys
+
+    from openalex import iter_topic_works
+
+    graph = CoauthorGraph()
+    added = graph.ingest_works(iter_topic_works(sys.argv[1:]))
+    graph.compact()
+    print(f"Ingested {added} works; {len(graph.authors)} authors, {len(graph.institutions)} institutions")
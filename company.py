@@ -7,6 +7,8 @@ class Company(ABC):
         self.name = name
         self.slug = (slug or name.lower().replace(" ", "_")).strip()
         self.job_board_payload: Any = None
+        # Set by parse_jobs: {"raw": items fetched, "parsed": jobs parsed}
+        self.crawl_stats: dict[str, int] = {"raw": 0, "parsed": 0}
 
     @abstractmethod
     def fetch_raw_jobs(self) -> list[Any]:
@@ -23,15 +25,22 @@ class Company(ABC):
           - title: str
           - url: str
           - meta: str (e.g. location | department | type)
+          - locations: list[{"city": str, "country": str}] (see locations.py)
+          - category: list[str] (job categories / departments)
+          - job_type: list[str] (e.g. ["Full-Time"], ["Internship"])
           - skill_bullets: list[str]
           - qualification_bullets: list[str]
           - profile_lines: list[str]  (intro/profile paragraph lines)
+          - description: str  (full description text, for search_index)
         """
         pass
 
     def get_jobs(self) -> list[dict]:
         """Fetch and parse all jobs. Caller can then assign ids and write CSVs."""
-        raw_list = self.fetch_raw_jobs()
+        return self.parse_jobs(self.fetch_raw_jobs())
+
+    def parse_jobs(self, raw_list: list[Any]) -> list[dict]:
+        """Parse already-fetched raw items, tagging each job with the company slug."""
         jobs = []
         for raw in raw_list:
             try:
@@ -41,4 +50,14 @@ class Company(ABC):
             except Exception as e:
                 # Log and skip bad entries
                 print(f"[{self.slug}] skip job: {e}")
+        self.crawl_stats = {"raw": len(raw_list), "parsed": len(jobs)}
         return jobs
+
+    def crawl_complete(self, min_parsed: float = 0.9) -> bool:
+        """
+        True if the last crawl returned postings and at least min_parsed of them
+        parsed. An empty or mostly unparseable crawl (markup change, bad
+        response) must not be read as every posting having been taken down.
+        """
+        raw, parsed = self.crawl_stats["raw"], self.crawl_stats["parsed"]
+        return parsed > 0 and parsed >= min_parsed * raw
@@ -0,0 +1,164 @@
+"""
+In-memory inverted index over job facets for interactive filtering.
+
+Each (facet, value) maps to a bitset of job positions stored as a Python int,
+so AND/OR across any number of values is a handful of big-int operations and
+counts are int.bit_count(). Facets: company, location, country, category,
+job_type, skill.
+
+    index = FacetIndex.from_csv()
+    index.query(location="New York", category="Software Engineering", skill="C++")
+    index.counts("skill", location="New York")
+"""
+
+import csv
+from typing import Iterable
+
+FACETS = ("company", "location", "country", "category", "job_type", "skill")
+
+# Must match jobs_cursor.MULTI_VALUE_SEP
+MULTI_VALUE_SEP = "; "
+
+
+def _key(value: str) -> str:
+    return value.strip().casefold()
+
+
+class FacetIndex:
+    def __init__(self):
+        self.job_ids: list[int] = []
+        self._pos: dict[int, int] = {}
+        # facet -> value key -> job positions (append-only; bitsets built lazily)
+        self._postings: dict[str, dict[str, list[int]]] = {f: {} for f in FACETS}
+        self._labels: dict[str, dict[str, str]] = {f: {} for f in FACETS}
+        self._bits: dict[str, dict[str, int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def add(self, job_id: int, **facets: str | Iterable[str]) -> None:
+        """Index one job. Each facet takes a value or an iterable of values."""
+        pos = self._pos.get(job_id)
+        if pos is None:
+            pos = self._pos[job_id] = len(self.job_ids)
+            self.job_ids.append(job_id)
+        for facet, values in facets.items():
+            if facet not in self._postings:
+                raise KeyError(f"unknown facet: {facet}")
+            if isinstance(values, str):
+                values = [values]
+            for value in values:
+                if not value or not value.strip():
+                    continue
+                key = _key(value)
+                self._labels[facet].setdefault(key, value.strip())
+                positions = self._postings[facet].setdefault(key, [])
+                if not positions or positions[-1] != pos:
+                    positions.append(pos)
+        self._bits = None
+
+    # -- bitsets ------------------------------------------------------------
+
+    def _freeze(self) -> dict[str, dict[str, int]]:
+        if self._bits is None:
+            nbytes = (len(self.job_ids) + 7) // 8
+            bits: dict[str, dict[str, int]] = {}
+            for facet, postings in self._postings.items():
+                bits[facet] = {}
+                for key, positions in postings.items():
+                    buf = bytearray(nbytes)
+                    for p in positions:
+                        buf[p >> 3] |= 1 << (p & 7)
+                    bits[facet][key] = int.from_bytes(buf, "little")
+            self._bits = bits
+        return self._bits
+
+    def bits(self, facet: str, value: str) -> int:
+        """Bitset of jobs having facet == value (0 if none)."""
+        return self._freeze()[facet].get(_key(value), 0)
+
+    def query_bits(self, **filters: str | Iterable[str]) -> int:
+        """
+        AND across facets, OR within a facet's list of values.
+        No filters selects every job.
+        """
+        result = (1 << len(self.job_ids)) - 1
+        for facet, values in filters.items():
+            if isinstance(values, str):
+                values = [values]
+            any_bits = 0
+            for value in values:
+                any_bits |= self.bits(facet, value)
+            result &= any_bits
+            if not result:
+                break
+        return result
+
+    # -- queries ------------------------------------------------------------
+
+    def query(self, **filters: str | Iterable[str]) -> list[int]:
+        """Job ids matching filters (see query_bits), in insertion order."""
+        return self.ids(self.query_bits(**filters))
+
+    def count(self, **filters: str | Iterable[str]) -> int:
+        return self.query_bits(**filters).bit_count()
+
+    def counts(self, facet: str, **filters: str | Iterable[str]) -> dict[str, int]:
+        """Per-value counts of `facet` among jobs matching filters, largest first."""
+        selected = self.query_bits(**filters)
+        labels = self._labels[facet]
+        counts = {
+            labels[key]: (b & selected).bit_count()
+            for key, b in self._freeze()[facet].items()
+        }
+        return dict(sorted(((v, c) for v, c in counts.items() if c), key=lambda kv: -kv[1]))
+
+    def values(self, facet: str) -> list[str]:
+        return sorted(self._labels[facet].values())
+
+    def ids(self, bits: int) -> list[int]:
+        out = []
+        for i, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+            while byte:
+                low = byte & -byte
+                out.append(self.job_ids[(i << 3) + low.bit_length() - 1])
+                byte ^= low
+        return out
+
+    # -- building -----------------------------------------------------------
+
+    @classmethod
+    def from_tables(cls, tables: dict[str, list[dict]]) -> "FacetIndex":
+        """Build from jobs_cursor.build_tables output (jobs + job_skills)."""
+        index = cls()
+        for row in tables.get("jobs", []):
+            index.add(
+                int(row["id"]),
+                company=row.get("company") or "",
+                location=(row.get("location") or "").split(MULTI_VALUE_SEP),
+                country=(row.get("country") or "").split(MULTI_VALUE_SEP),
+                category=(row.get("category") or "").split(MULTI_VALUE_SEP),
+                job_type=(row.get("job_type") or "").split(MULTI_VALUE_SEP),
+            )
+        for row in tables.get("job_skills", []):
+            index.add(int(row["job_id"]), skill=row["skill"])
+        return index
+
+    @classmethod
+    def from_csv(
+        cls,
+        jobs_path: str = "data/jobs.csv",
+        job_skills_path: str = "data/job_skills.csv",
+    ) -> "FacetIndex":
+        with open(jobs_path, newline="", encoding="utf-8") as f:
+            jobs = list(csv.DictReader(f))
+        with open(job_skills_path, newline="", encoding="utf-8") as f:
+            skills = list(csv.DictReader(f))
+        return cls.from_tables({"jobs": jobs, "job_skills": skills})
+
+
+if __name__ == "__main__":
+    index = FacetIndex.from_csv()
+    print(f"{len(index)} jobs")
+    for facet in FACETS:
+        print(f"{facet}: {list(index.counts(facet).items())[:10]}")
@@ -6,12 +6,18 @@ import csv
 import json
 import re
 import requests
+from datetime import date
 from bs4 import BeautifulSoup
 
 from company import Company
+from locations import normalize_locations
 from skills_extractor import extract_skills_from_bullets
 from qualifications_extractor import extract_qualifications_from_bullets
 from profile_extractor import extract_profile_terms
+from canonical_terms import vocabulary_rows
+from search_index import JobSearchIndex
+from columnar_export import write_columnar_tables
+from change_feed import emit_change_feed
 
 
 # ---------------------------------------------------------------------------
@@ -74,6 +80,17 @@ HRT_SETTING = {
     "settings": {"hide_job_id": True},
 }
 
+# Card facets, in the order the cards render them (one .hrt-card-info-item each)
+HRT_META_TERMS = [m["term"] for m in HRT_SETTING["meta_data"]]
+
+# Substrings that identify a facet's .hrt-card-info-item by its own markup
+# (class / data attributes / icon of the item or its children)
+HRT_META_MARKERS = {
+    "locations": ("location",),
+    "job-category": ("category", "department"),
+    "job-type": ("job-type", "job_type", "jobtype", "employment"),
+}
+
 HRT_PAYLOAD = {
     "action": "get_hrt_jobs_handler",
     "data[search]": "",
@@ -87,12 +104,50 @@ HRT_HEADERS = {
 }
 
 
+def _markup_text(el) -> str:
+    """Lowercased class / attribute values of an element and its descendants."""
+    parts = []
+    for node in [el, *el.find_all(True)]:
+        for value in node.attrs.values():
+            parts.extend(value if isinstance(value, list) else [str(value)])
+    return " ".join(parts).lower()
+
+
+def hrt_card_facets(soup: BeautifulSoup) -> dict[str, list[str]]:
+    """
+    Card facet values by HRT_META_TERMS term. Each .hrt-card-info-item is
+    identified by its own markup (HRT_META_MARKERS). Unmarked items fall back
+    to render order only when the card shows every facet; otherwise they are
+    dropped rather than guessed (a missing facet would shift the rest).
+    """
+    items = soup.select(".hrt-card-info-item")
+    facets: dict[str, list[str]] = {}
+    unmarked = []
+    for item in items:
+        markup = _markup_text(item)
+        term = next(
+            (t for t in HRT_META_TERMS if t not in facets and any(m in markup for m in HRT_META_MARKERS[t])),
+            None,
+        )
+        values = [s.get_text(strip=True) for s in item.select("span") if s.get_text(strip=True)]
+        if term:
+            facets[term] = values
+        else:
+            unmarked.append(values)
+    if unmarked and len(items) == len(HRT_META_TERMS):
+        for term, values in zip([t for t in HRT_META_TERMS if t not in facets], unmarked):
+            facets[term] = values
+    return facets
+
+
 class HRTCompany(Company):
-    def __init__(self):
+    def __init__(self, session: requests.Session | None = None):
         super().__init__(name="Hudson River Trading", slug="hrt")
+        # Anything with requests' post(); replay.py passes recording/replay sessions
+        self.session = session or requests
 
     def fetch_raw_jobs(self):
-        r = requests.post(HRT_AJAX_URL, data=HRT_PAYLOAD, headers=HRT_HEADERS, timeout=30)
+        r = self.session.post(HRT_AJAX_URL, data=HRT_PAYLOAD, headers=HRT_HEADERS, timeout=30)
         r.raise_for_status()
         return r.json()
 
@@ -104,6 +159,8 @@ class HRTCompany(Company):
         meta = [m.get_text(strip=True) for m in soup.select(".hrt-card-info-item span")]
         meta_str = " | ".join(meta)
 
+        facets = hrt_card_facets(soup)
+
         description = parse_sections(raw["description"])
         bullets = description["skills"]
         for i, item in enumerate(bullets):
@@ -124,79 +181,155 @@ class HRTCompany(Company):
             "title": title,
             "url": url,
             "meta": meta_str,
+            "locations": normalize_locations(facets.get("locations", [])),
+            "category": facets.get("job-category", []),
+            "job_type": facets.get("job-type", []),
             "skill_bullets": bullets,
             "qualification_bullets": qual_bullets,
             "profile_lines": profile_lines,
+            "description": raw["description"],
         }
 
 
 # ---------------------------------------------------------------------------
-# Storage: jobs.csv (id, company, title, url, meta) + job_skills.csv (job_id, skill, category)
+# Storage: jobs.csv (id, company, title, url, meta, facets) + job_skills.csv (job_id, skill, category)
 # ---------------------------------------------------------------------------
 
-def write_jobs_and_skills(
-    jobs: list[dict],
-    jobs_path: str = "data/jobs.csv",
-    job_skills_path: str = "data/job_skills.csv",
-    job_qualifications_path: str = "data/job_qualifications.csv",
-    job_profile_path: str = "data/job_profile.csv",
-) -> None:
+# Separator for multi-valued columns (location, country, category, job_type) in the CSVs
+MULTI_VALUE_SEP = "; "
+
+
+def _join_values(values: str | list[str] | None) -> str:
+    """A multi-valued column as one CSV cell (a plain string passes through)."""
+    if isinstance(values, str):
+        return values
+    return MULTI_VALUE_SEP.join(v for v in values or [] if v)
+
+
+TABLE_FIELDS = {
+    "jobs": ["id", "company", "title", "url", "meta", "location", "country", "category", "job_type"],
+    "job_skills": ["job_id", "skill", "category", "term_id"],
+    "job_qualifications": ["job_id", "qualification", "category", "term_id"],
+    "job_profile": ["job_id", "term", "category", "term_id"],
+    # Canonical term vocabulary (canonical_terms) the term_id columns refer to
+    "terms": ["term_id", "term"],
+    # Only filled in bounded mode: bullets clipped by the per-bullet budget
+    "job_truncations": ["job_id", "section", "bullet", "length", "reason", "kept", "stage"],
+}
+
+
+def build_tables(jobs: list[dict], bounded: bool = False) -> dict[str, list[dict]]:
     """
-    Assign each job an id, write jobs and correlation CSVs.
+    Assign each job an id and run the extractors.
+    Returns {table name: rows} for every table in TABLE_FIELDS.
     Jobs must have: company, title, url, meta, skill_bullets, qualification_bullets, profile_lines.
+    bounded=True runs the skill/qualification extractors in bounded mode and
+    reports clipped bullets in job_truncations.
     """
     job_rows = []
     skill_rows = []
     qualification_rows = []
     profile_rows = []
+    truncation_rows = []
 
     for job_id, job in enumerate(jobs, start=1):
+        locations = job.get("locations") or []
         job_rows.append({
             "id": job_id,
             "company": job["company"],
             "title": job["title"],
             "url": job["url"],
             "meta": job["meta"],
+            "location": MULTI_VALUE_SEP.join(loc["city"] for loc in locations if loc["city"]),
+            "country": MULTI_VALUE_SEP.join(dict.fromkeys(loc["country"] for loc in locations if loc["country"])),
+            "category": _join_values(job.get("category")),
+            "job_type": _join_values(job.get("job_type")),
         })
-        for e in extract_skills_from_bullets(job.get("skill_bullets") or []):
-            skill_rows.append({"job_id": job_id, "skill": e["skill"], "category": e["category"]})
-        for e in extract_qualifications_from_bullets(job.get("qualification_bullets") or []):
+        skill_truncations: list[dict] = []
+        qualification_truncations: list[dict] = []
+        for e in extract_skills_from_bullets(
+            job.get("skill_bullets") or [], bounded=bounded, truncations=skill_truncations
+        ):
+            skill_rows.append({
+                "job_id": job_id,
+                "skill": e["skill"],
+                "category": e["category"],
+                "term_id": e["term_id"],
+            })
+        for e in extract_qualifications_from_bullets(
+            job.get("qualification_bullets") or [], bounded=bounded, truncations=qualification_truncations
+        ):
             qualification_rows.append({
                 "job_id": job_id,
                 "qualification": e["qualification"],
                 "category": e["category"],
+                "term_id": e["term_id"],
             })
         for e in extract_profile_terms(job.get("profile_lines") or []):
             profile_rows.append({
                 "job_id": job_id,
                 "term": e["term"],
                 "category": e["category"],
+                "term_id": e["term_id"],
             })
+        for section, truncations in (("skills", skill_truncations), ("qualifications", qualification_truncations)):
+            for t in truncations:
+                truncation_rows.append({"job_id": job_id, "section": section, **t})
+
+    return {
+        "jobs": job_rows,
+        "job_skills": skill_rows,
+        "job_qualifications": qualification_rows,
+        "job_profile": profile_rows,
+        "job_truncations": truncation_rows,
+        "terms": vocabulary_rows(),
+    }
 
-    with open(jobs_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["id", "company", "title", "url", "meta"])
-        writer.writeheader()
-        writer.writerows(job_rows)
 
-    with open(job_skills_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["job_id", "skill", "category"])
-        writer.writeheader()
-        writer.writerows(skill_rows)
+def write_csv_tables(tables: dict[str, list[dict]], paths: dict[str, str]) -> None:
+    """Write each table named in paths (table name -> CSV path) with its TABLE_FIELDS header."""
+    for name, path in paths.items():
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=TABLE_FIELDS[name])
+            writer.writeheader()
+            writer.writerows(tables[name])
 
-    with open(job_qualifications_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["job_id", "qualification", "category"])
-        writer.writeheader()
-        writer.writerows(qualification_rows)
 
-    with open(job_profile_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["job_id", "term", "category"])
-        writer.writeheader()
-        writer.writerows(profile_rows)
+def write_jobs_and_skills(
+    jobs: list[dict],
+    jobs_path: str = "data/jobs.csv",
+    job_skills_path: str = "data/job_skills.csv",
+    job_qualifications_path: str = "data/job_qualifications.csv",
+    job_profile_path: str = "data/job_profile.csv",
+    job_truncations_path: str = "data/job_truncations.csv",
+    terms_path: str = "data/terms.csv",
+    bounded: bool = False,
+) -> dict[str, list[dict]]:
+    """
+    Assign each job an id, write jobs and correlation CSVs.
+    Jobs must have: company, title, url, meta, skill_bullets, qualification_bullets, profile_lines.
+    With bounded=True, clipped bullets are also written to job_truncations_path.
+    Returns the tables that were written (see build_tables).
+    """
+    tables = build_tables(jobs, bounded=bounded)
+    paths = {
+        "jobs": jobs_path,
+        "job_skills": job_skills_path,
+        "job_qualifications": job_qualifications_path,
+        "job_profile": job_profile_path,
+        "terms": terms_path,
+    }
+    if bounded:
+        paths["job_truncations"] = job_truncations_path
+    write_csv_tables(tables, paths)
 
     print(
-        f"Wrote {len(job_rows)} jobs to {jobs_path}; "
-        f"{len(skill_rows)} skills, {len(qualification_rows)} qualifications, {len(profile_rows)} profile terms"
+        f"Wrote {len(tables['jobs'])} jobs to {jobs_path}; "
+        f"{len(tables['job_skills'])} skills, {len(tables['job_qualifications'])} qualifications, "
+        f"{len(tables['job_profile'])} profile terms"
+        + (f"; {len(tables['job_truncations'])} truncated bullets" if bounded else "")
     )
+    return tables
 
 
 # ---------------------------------------------------------------------------
@@ -211,4 +344,13 @@ if __name__ == "__main__":
         all_jobs.extend(jobs)
         print(f"[{company.slug}] {len(jobs)} jobs")
 
-    write_jobs_and_skills(all_jobs)
+    # Only complete crawls may retire postings (search index, change feed)
+    complete = [c.slug for c in companies if c.crawl_complete()]
+    crawl_date = date.today().isoformat()
+    tables = write_jobs_and_skills(all_jobs, bounded=True)
+    write_columnar_tables(tables, crawl_date=crawl_date)
+    with JobSearchIndex() as index:
+        indexed = index.add_jobs(all_jobs, tables["jobs"], crawl_date=crawl_date, companies=complete)
+        print(f"Indexed {indexed} new or changed descriptions")
+    changes = emit_change_feed(all_jobs, tables, crawled=complete)
+    print(f"Change feed: {len(changes)} events")
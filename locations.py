@@ -0,0 +1,114 @@
+"""
+Normalize free-text job locations to canonical (city, country) pairs.
+
+Job boards write the same office many ways ("NYC", "New York, NY",
+"New York City"). normalize_locations() maps each to one canonical city and
+country so locations can be used as an exact-match facet.
+"""
+
+import re
+
+# ---------------------------------------------------------------------------
+# Canonical cities: (city, country) -> aliases (matched case-insensitively)
+# ---------------------------------------------------------------------------
+
+CITIES = {
+    ("New York", "United States"): {"New York", "New York City", "NYC", "New York, NY", "Manhattan"},
+    ("Chicago", "United States"): {"Chicago", "Chicago, IL"},
+    ("Austin", "United States"): {"Austin", "Austin, TX"},
+    ("Boston", "United States"): {"Boston", "Boston, MA"},
+    ("Miami", "United States"): {"Miami", "Miami, FL"},
+    ("Dallas", "United States"): {"Dallas", "Dallas, TX"},
+    ("Stamford", "United States"): {"Stamford", "Stamford, CT", "Greenwich", "Greenwich, CT"},
+    ("San Francisco", "United States"): {"San Francisco", "San Francisco, CA", "SF", "Bay Area"},
+    ("Seattle", "United States"): {"Seattle", "Seattle, WA"},
+    ("Philadelphia", "United States"): {"Philadelphia", "Philadelphia, PA", "Bala Cynwyd", "Bala Cynwyd, PA"},
+    ("Toronto", "Canada"): {"Toronto", "Toronto, ON", "Toronto, Ontario"},
+    ("Montreal", "Canada"): {"Montreal", "Montréal", "Montreal, QC"},
+    ("London", "United Kingdom"): {"London", "London, UK", "London, United Kingdom", "London, England"},
+    ("Dublin", "Ireland"): {"Dublin", "Dublin, Ireland"},
+    ("Amsterdam", "Netherlands"): {"Amsterdam", "Amsterdam, NL", "Amsterdam, Netherlands"},
+    ("Paris", "France"): {"Paris", "Paris, France"},
+    ("Zug", "Switzerland"): {"Zug", "Zug, Switzerland"},
+    ("Singapore", "Singapore"): {"Singapore", "SG"},
+    ("Hong Kong", "Hong Kong"): {"Hong Kong", "HK", "Hong Kong SAR"},
+    ("Shanghai", "China"): {"Shanghai", "Shanghai, China"},
+    ("Tokyo", "Japan"): {"Tokyo", "Tokyo, Japan"},
+    ("Sydney", "Australia"): {"Sydney", "Sydney, Australia", "Sydney, NSW"},
+    ("Mumbai", "India"): {"Mumbai", "Bombay", "Mumbai, India"},
+    ("Gurugram", "India"): {"Gurugram", "Gurgaon", "Gurugram, India"},
+    ("New Delhi", "India"): {"New Delhi", "Delhi", "New Delhi, India"},
+    ("Dubai", "United Arab Emirates"): {"Dubai", "Dubai, UAE"},
+    ("Remote", ""): {"Remote", "Anywhere", "Work from home"},
+}
+
+# Country-only values ("United States", "UK") keep city empty
+COUNTRIES = {
+    "United States": {"United States", "USA", "US", "U.S.", "United States of America"},
+    "United Kingdom": {"United Kingdom", "UK", "U.K.", "England", "Great Britain"},
+    "Canada": {"Canada"},
+    "India": {"India"},
+    "Australia": {"Australia"},
+    "Netherlands": {"Netherlands", "The Netherlands"},
+}
+
+_ALIASES: dict[str, dict] = {}
+for (_city, _country), _aliases in CITIES.items():
+    for _a in _aliases | {_city}:
+        _ALIASES[_a.lower()] = {"city": _city, "country": _country}
+for _country, _aliases in COUNTRIES.items():
+    for _a in _aliases | {_country}:
+        _ALIASES.setdefault(_a.lower(), {"city": "", "country": _country})
+
+# Separators between several locations in one string
+_MULTI_SPLIT = re.compile(r"\s*(?:;|\||/|\s&\s|\sand\s|\sor\s)\s*", re.I)
+
+
+def _lookup(s: str) -> dict | None:
+    found = _ALIASES.get(s.strip().lower().rstrip("."))
+    return dict(found) if found else None
+
+
+def normalize_location(raw: str) -> list[dict]:
+    """
+    Map one location string to canonical {"city": str, "country": str} dicts.
+    Splits multi-location strings ("New York / London", "Chicago, Austin").
+    Unknown places are kept as-is with an empty country.
+    """
+    result: list[dict] = []
+    for part in _MULTI_SPLIT.split(raw or ""):
+        part = part.strip()
+        if not part:
+            continue
+        found = _lookup(part)
+        if found:
+            result.append(found)
+            continue
+        pieces = [p.strip() for p in part.split(",") if p.strip()]
+        # "City, Region" / "City, Country": the second piece is not itself a city
+        if len(pieces) == 2:
+            head, tail = _lookup(pieces[0]), _lookup(pieces[1])
+            if not (tail and tail["city"]):
+                if head and head["city"]:
+                    result.append(head)
+                else:
+                    result.append({"city": pieces[0], "country": tail["country"] if tail else ""})
+                continue
+        # Otherwise treat commas as a list of places
+        for piece in pieces:
+            result.append(_lookup(piece) or {"city": piece, "country": ""})
+    return result
+
+
+def normalize_locations(raws: list[str]) -> list[dict]:
+    """normalize_location over several strings, de-duplicated, order kept."""
+    seen = set()
+    result: list[dict] = []
+    for raw in raws:
+        for loc in normalize_location(raw):
+            key = (loc["city"], loc["country"])
+            if key in seen:
+                continue
+            seen.add(key)
+            result.append(loc)
+    return result
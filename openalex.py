@@ -1,10 +1,10 @@
+import csv
 import requests
 from bs4 import BeautifulSoup
 import json
 import math
 import pandas as pd
 from pydantic import BaseModel
-import ddd
 
 def flatten(xss):
     return [x for xs in xss for x in xs]
@@ -16,10 +16,15 @@ PAGE_QUERY = "&page="
 PERPAGE_QUERY = "&per_page="
 API_KEY = "&api_key="
 
-def get_tags(doi):
-    return json.loads(requests.get(f"{BASE_URL}{WORKS}/https://doi.org/{doi}").content)
+# Works in one primary topic, open-access on arXiv, published after 2024
+WORKS_FILTER = "primary_topic.id:{topic},best_oa_location.source.id:S4306400194,publication_year:%3E2024"
+# Fields pulled per work when paging through results
+WORK_SELECT = "id,doi,display_name,publication_year,primary_topic,authorships"
 
-def get_items():
+def get_tags(doi, session=requests):
+    return json.loads(session.get(f"{BASE_URL}{WORKS}/https://doi.org/{doi}").content)
+
+def get_items(session=requests):
     keywords = ["Parallel", "Interconnect", "Computing", "Technology", "Optic", "Photonic"]
 
     pattern = r"Parallel|Interconnect|Computing|Technology|Optic|Photonic|Network"
@@ -29,8 +34,57 @@ def get_items():
     df = df[df["id_topic"].str.contains(pattern, case=False, na=False)]
 
     for id in set(df["id_name"]):
-        data = json.loads(requests.get(f"{BASE_URL}/works?filter=primary_topic.id:{id},best_oa_location.source.id:S4306400194,publication_year:%3E2024").content)
+        data = json.loads(session.get(f"{BASE_URL}{WORKS}?filter={WORKS_FILTER.format(topic=id)}").content)
         count = data["meta"]["count"]
         print(count)
+
+def iter_works(filters, session=requests, per_page=200):
+    """Yield every work matching an OpenAlex filter string, following cursor pagination."""
+    cursor = "*"
+    while cursor:
+        url = f"{BASE_URL}{WORKS}?filter={filters}&select={WORK_SELECT}{PERPAGE_QUERY}{per_page}&cursor={cursor}"
+        r = session.get(url, timeout=30)
+        r.raise_for_status()
+        data = r.json()
+        if not data["results"]:
+            break
+        yield from data["results"]
+        cursor = data["meta"].get("next_cursor")
+
+def iter_topic_works(topic_ids, session=requests):
+    """iter_works over WORKS_FILTER for each topic id (e.g. "T10054")."""
+    for topic in topic_ids:
+        yield from iter_works(WORKS_FILTER.format(topic=topic), session=session)
+
+# Flat works table (works.csv), shared with the snapshot reader
+WORK_FIELDS = ["id", "doi", "display_name", "publication_year", "primary_topic", "authors"]
+
+def short_id(openalex_id):
+    return (openalex_id or "").rsplit("/", 1)[-1]
+
+def work_row(work):
+    """Flatten one work dict (WORK_SELECT fields) into a WORK_FIELDS row."""
+    return {
+        "id": short_id(work.get("id")),
+        "doi": work.get("doi") or "",
+        "display_name": work.get("display_name") or "",
+        "publication_year": work.get("publication_year") or "",
+        "primary_topic": short_id((work.get("primary_topic") or {}).get("id")),
+        "authors": ";".join(
+            short_id((a.get("author") or {}).get("id")) for a in work.get("authorships") or []
+        ),
+    }
+
+def write_works_csv(works, path="data/works.csv"):
+    """Stream work dicts into a works table; returns the row count."""
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=WORK_FIELDS)
+        writer.writeheader()
+        for work in works:
+            writer.writerow(work_row(work))
+            n += 1
+    return n
         
-print(get_tags('10.48550/arXiv.2505.03764'))
\ No newline at end of file
+if __name__ == "__main__":
+    print(get_tags('10.48550/arXiv.2505.03764'))
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Streaming reader for local OpenAlex snapshot dumps.
+
+A snapshot mirror is laid out as gzipped JSON-lines partitions:
+
+    <root>/data/<entity>/updated_date=YYYY-MM-DD/part_000.gz
+
+Partitions are scanned in parallel (one process per core). Each is read line
+by line, filtered (topic / year / source) and projected to the WORK_SELECT
+fields the API path requests, and written to a gzipped JSON-lines shard, so
+neither a partition nor the result set is ever held in memory. The shards
+then feed the same tables the API path produces: data/works.csv (via
+openalex.write_works_csv), data/merged_<domain>.csv for topics, or
+CoauthorGraph.ingest_works.
+
+    python openalex_snapshot.py works /mnt/openalex --topic T10054 --min-year 2025
+    python openalex_snapshot.py topics /mnt/openalex --domain 3
+"""
+
+import argparse
+import csv
+import glob
+import gzip
+import json
+import os
+import shutil
+from functools import partial
+from multiprocessing import Pool
+from typing import Iterator, Sequence
+
+from openalex import WORK_SELECT, short_id, write_works_csv
+
+# Topic table columns, as read by openalex.get_items (id_name = topic id, id_topic = name)
+TOPIC_FIELDS = ["id_name", "id_topic"]
+
+
+def list_partitions(root: str, entity: str) -> list[str]:
+    """All .gz partitions of one entity, largest first (better load balancing)."""
+    paths = glob.glob(os.path.join(root, "data", entity, "updated_date=*", "*.gz"))
+    return sorted(paths, key=lambda p: -os.path.getsize(p))
+
+
+def _get(record: dict, dotted: str):
+    for key in dotted.split("."):
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+
+def _work_matches(
+    work: dict,
+    topic_ids: frozenset[str],
+    min_year: int | None,
+    max_year: int | None,
+    source_ids: frozenset[str],
+) -> bool:
+    if topic_ids and short_id(_get(work, "primary_topic.id")) not in topic_ids:
+        return False
+    year = work.get("publication_year")
+    if min_year is not None and (year is None or year < min_year):
+        return False
+    if max_year is not None and (year is None or year > max_year):
+        return False
+    if source_ids and short_id(_get(work, "best_oa_location.source.id")) not in source_ids:
+        return False
+    return True
+
+
+def _scan_works_partition(
+    path: str,
+    out_dir: str,
+    fields: Sequence[str],
+    topic_ids: frozenset[str],
+    min_year: int | None,
+    max_year: int | None,
+    source_ids: frozenset[str],
+) -> tuple[str, int, int]:
+    """Filter + project one partition into a shard. Returns (shard, kept, scanned)."""
+    date_dir = os.path.basename(os.path.dirname(path))
+    shard = os.path.join(out_dir, f"{date_dir}_{os.path.basename(path)[:-3]}.jsonl.gz")
+    kept = scanned = 0
+    with gzip.open(path, "rt", encoding="utf-8") as src, gzip.open(shard, "wt", encoding="utf-8") as dst:
+        for line in src:
+            scanned += 1
+            # Cheap substring reject before paying for json.loads
+            if topic_ids and not any(t in line for t in topic_ids):
+                continue
+            work = json.loads(line)
+            if not _work_matches(work, topic_ids, min_year, max_year, source_ids):
+                continue
+            dst.write(json.dumps({f: work.get(f) for f in fields}) + "\n")
+            kept += 1
+    return shard, kept, scanned
+
+
+def scan_works(
+    root: str,
+    out_dir: str = "data/snapshot_works",
+    topic_ids: Sequence[str] = (),
+    min_year: int | None = None,
+    max_year: int | None = None,
+    source_ids: Sequence[str] = (),
+    fields: Sequence[str] = tuple(WORK_SELECT.split(",")),
+    processes: int | None = None,
+) -> dict:
+    """
+    Scan every works partition under root in parallel, writing filtered and
+    projected shards to out_dir. Returns {"partitions", "scanned", "kept"}.
+
+    Shards are written to a staging directory that replaces out_dir once the
+    scan succeeds, so shards of partitions dropped or renamed by a mirror sync
+    (or of a previous root) never reach iter_shards.
+    """
+    staging = out_dir.rstrip(os.sep) + ".partial"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    partitions = list_partitions(root, "works")
+    scan = partial(
+        _scan_works_partition,
+        out_dir=staging,
+        fields=list(fields),
+        topic_ids=frozenset(short_id(t) for t in topic_ids),
+        min_year=min_year,
+        max_year=max_year,
+        source_ids=frozenset(short_id(s) for s in source_ids),
+    )
+    stats = {"partitions": len(partitions), "scanned": 0, "kept": 0}
+    with Pool(processes) as pool:
+        for shard, kept, scanned in pool.imap_unordered(scan, partitions, chunksize=1):
+            stats["scanned"] += scanned
+            stats["kept"] += kept
+            if not kept:
+                os.remove(shard)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(staging, out_dir)
+    return stats
+
+
+def iter_shards(out_dir: str = "data/snapshot_works") -> Iterator[dict]:
+    """Stream projected works back out of the shards written by scan_works."""
+    for shard in sorted(glob.glob(os.path.join(out_dir, "*.jsonl.gz"))):
+        with gzip.open(shard, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def write_topics(root: str, domain: int | str | None = None, path: str | None = None) -> int:
+    """
+    Stream the topics entity into the topic table old.py builds from the API
+    (data/merged_<domain>.csv), optionally limited to one domain id.
+    """
+    path = path or f"data/merged_{domain if domain is not None else 'all'}.csv"
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=TOPIC_FIELDS)
+        writer.writeheader()
+        for part in sorted(list_partitions(root, "topics")):
+            with gzip.open(part, "rt", encoding="utf-8") as src:
+                for line in src:
+                    topic = json.loads(line)
+                    if domain is not None and short_id(_get(topic, "domain.id")) != str(domain):
+                        continue
+                    writer.writerow({"id_name": short_id(topic.get("id")), "id_topic": topic.get("display_name")})
+                    n += 1
+    return n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read a local OpenAlex snapshot.")
+    sub = parser.add_subparsers(dest="entity", required=True)
+
+    works = sub.add_parser("works", help="filter works into shards and data/works.csv")
+    works.add_argument("root")
+    works.add_argument("--out-dir", default="data/snapshot_works")
+    works.add_argument("--topic", action="append", default=[], help="primary topic id (repeatable)")
+    works.add_argument("--source", action="append", default=[], help="best OA source id (repeatable)")
+    works.add_argument("--min-year", type=int)
+    works.add_argument("--max-year", type=int)
+    works.add_argument("--processes", type=int)
+    works.add_argument("--works-csv", default="data/works.csv")
+
+    topics = sub.add_parser("topics", help="write the topic table")
+    topics.add_argument("root")
+    topics.add_argument("--domain")
+
+    args = parser.parse_args()
+    if args.entity == "works":
+        stats = scan_works(
+            args.root,
+            out_dir=args.out_dir,
+            topic_ids=args.topic,
+            min_year=args.min_year,
+            max_year=args.max_year,
+            source_ids=args.source,
+            processes=args.processes,
+        )
+        rows = write_works_csv(iter_shards(args.out_dir), args.works_csv)
+        print(f"Scanned {stats['scanned']} works in {stats['partitions']} partitions; wrote {rows} to {args.works_csv}")
+    else:
+        print(f"Wrote {write_topics(args.root, args.domain)} topics")
@@ -7,6 +7,8 @@ Captures role type, technologies, work arrangement (hybrid, remote).
 import re
 from typing import Sequence
 
+from canonical_terms import TERMS, TermTrie, canonical, term_id
+
 # ---------------------------------------------------------------------------
 # Profile lexicons
 # ---------------------------------------------------------------------------
@@ -27,6 +29,10 @@ PROFILE_TECH = {
     "filesystem", "core dump", "packages", "upstream",
 }
 
+# Lexicon terms and their aliases, for one-pass matching
+WORK_ARRANGEMENT_TRIE = TermTrie(WORK_ARRANGEMENT)
+PROFILE_TRIE = TermTrie(PROFILE_TECH)
+
 LIST_LIKE = [
     re.compile(r"\b(?:with|using|including)\s+([^.]+?)(?:\.|$)", re.I),
     re.compile(r"\b(?:experience with|experience in)\s+([^.]+?)(?:\.|$)", re.I),
@@ -34,13 +40,14 @@ LIST_LIKE = [
 
 
 def _normalize(s: str) -> str:
-    return s.strip()
+    return canonical(s.strip())
 
 
 def extract_profile_terms(profile_lines: Sequence[str]) -> list[dict]:
     """
     From profile intro text (list of lines or one string), extract terms.
-    Returns list of {"term": str, "category": str}.
+    Returns list of {"term": str, "category": str, "term_id": int | None}
+    (canonical terms, see canonical_terms).
     Categories: work_arrangement, role, technology, other.
     """
     text = "\n".join(profile_lines) if isinstance(profile_lines, (list, tuple)) else profile_lines
@@ -58,12 +65,11 @@ def extract_profile_terms(profile_lines: Sequence[str]) -> list[dict]:
         if key in seen:
             return
         seen.add(key)
-        result.append({"term": s, "category": category})
+        result.append({"term": s, "category": category, "term_id": term_id(s)})
 
     # 1) Work arrangement
-    for w in WORK_ARRANGEMENT:
-        if re.search(rf"\b{re.escape(w)}\b", text, re.I):
-            add(w, "work_arrangement")
+    for _, _, tid in WORK_ARRANGEMENT_TRIE.scan(text):
+        add(TERMS[tid], "work_arrangement")
 
     # 2) Role-ish phrases (e.g. "Lustre Engineer")
     for r in ROLE_KEYWORDS:
@@ -72,19 +78,8 @@ def extract_profile_terms(profile_lines: Sequence[str]) -> list[dict]:
             for m in re.finditer(rf"(\w+\s+{re.escape(r)})", text, re.I):
                 add(m.group(1), "role")
 
-    # 3) Tech in profile
-    for t in PROFILE_TECH:
-        if re.search(rf"\b{re.escape(t)}\b", text, re.I):
-            add(t, "technology")
-
-    # 4) Common tech phrases
-    if "Lustre" in text or "lustre" in text:
-        add("Lustre", "technology")
-    if re.search(r"CI/CD", text, re.I):
-        add("CI/CD", "technology")
-    if re.search(r"core dump", text, re.I):
-        add("core dump", "technology")
-    if re.search(r"filesystem", text, re.I):
-        add("filesystem", "technology")
+    # 3) Tech in profile (whole-word, one pass)
+    for _, _, tid in PROFILE_TRIE.scan(text):
+        add(TERMS[tid], "technology")
 
     return result
@@ -7,6 +7,15 @@ Produces normalized tokens: degrees, fields, technologies, soft skills.
 import re
 from typing import Sequence
 
+from bounded_scan import (
+    DEFAULT_MAX_BULLET_CHARS,
+    DEFAULT_MAX_BULLET_SECONDS,
+    PARENTHESES,
+    BulletBudget,
+    iter_list_phrases,
+)
+from canonical_terms import TERMS, TermTrie, canonical, is_fragment, term_id
+
 # Reuse tech lexicons from skills_extractor for consistency
 from skills_extractor import (
     LANGUAGES,
@@ -16,25 +25,24 @@ from skills_extractor import (
 )
 
 # ---------------------------------------------------------------------------
-# Qualification-specific lexicons
+# Qualification-specific lexicons (canonical names; spellings such as "B.S."
+# or "Ph.D." are aliases in canonical_terms.ALIASES)
 # ---------------------------------------------------------------------------
 
 DEGREES = {
-    "Bachelor's", "Bachelors", "Bachelor", "BS", "B.S.", "BA", "B.A.",
-    "Master's", "Masters", "Master", "MS", "M.S.", "MA", "M.A.", "MSc", "MSc.",
-    "PhD", "Ph.D.", "Doctorate", "MBA", "M.B.A.",
+    "Bachelor's", "Master's", "PhD", "MBA",
 }
 
 FIELDS = {
-    "Computer Science", "Engineering", "Electrical Engineering", "EE",
+    "Computer Science", "Engineering", "Electrical Engineering",
     "Computer Engineering", "Mathematics", "Physics", "Related field",
     "STEM", "Statistics", "Data Science",
 }
 
 SOFT_SKILLS = {
     "communication", "written communication", "verbal communication",
-    "multitasking", "time management", "work independently", "collaborate",
-    "collaboration", "teamwork", "problem solving", "analytical",
+    "multitasking", "time management", "work independently",
+    "collaboration", "problem solving", "analytical",
     "attention to detail", "leadership", "self-starter", "motivated",
     "organizational skills", "prioritization", "stakeholder",
     "technical writing", "documentation", "explain", "mentoring",
@@ -45,6 +53,9 @@ QUALIFICATION_TECH = {
     "Lustre", "CI/CD", "Jira", "Linux", "kernel", "Python", "C++", "C",
 }
 
+# All lexicon terms and their aliases, for one-pass matching
+QUALIFICATION_TRIE = TermTrie(DEGREES | FIELDS | SOFT_SKILLS | LANGUAGES | TOOLS | QUALIFICATION_TECH)
+
 LIST_PATTERNS = [
     re.compile(r"\b(?:degree|in)\s+([^.]+?)(?:\.|$)", re.I),
     re.compile(r"\(([^)]+)\)"),
@@ -52,9 +63,17 @@ LIST_PATTERNS = [
     re.compile(r"\bsuch as\s+([^.]+?)(?:\.|$)", re.I),
 ]
 
+# Same lists for bounded mode: fixed-width triggers, phrases cut by bounded_scan
+BOUNDED_LIST_TRIGGERS = [
+    re.compile(r"\b(?:degree|in)\s", re.I),
+    PARENTHESES,
+    re.compile(r"\b(?:experience with|working with|experience in)\s", re.I),
+    re.compile(r"\bsuch as\s", re.I),
+]
+
 
 def _normalize(s: str) -> str:
-    return s.strip()
+    return canonical(s.strip())
 
 
 def _split_list_phrase(phrase: str) -> list[str]:
@@ -82,14 +101,28 @@ def _category_qualification(token: str) -> str:
     return "other"
 
 
-def extract_qualifications_from_bullets(bullets: Sequence[str]) -> list[dict]:
+def _iter_list_phrases(text: str) -> list[str]:
+    return [m.group(1).strip() for pat in LIST_PATTERNS for m in pat.finditer(text)]
+
+
+def extract_qualifications_from_bullets(
+    bullets: Sequence[str],
+    bounded: bool = False,
+    max_bullet_chars: int = DEFAULT_MAX_BULLET_CHARS,
+    max_bullet_seconds: float = DEFAULT_MAX_BULLET_SECONDS,
+    truncations: list[dict] | None = None,
+) -> list[dict]:
     """
     From a list of qualification bullets, extract distinctive tokens.
-    Returns list of {"qualification": str, "category": str}.
+    Returns list of {"qualification": str, "category": str, "term_id": int | None}
+    with canonical terms (see skills_extractor.extract_skills_from_bullets).
     Drops salary/benefits lines.
+    bounded / max_bullet_* / truncations: as in skills_extractor.extract_skills_from_bullets.
     """
     seen = set()
     result: list[dict] = []
+    budget = BulletBudget(max_bullet_chars, max_bullet_seconds, truncations) if bounded else None
+    lexicon_stop = (lambda: budget.expired("lexicon")) if budget else None
 
     def add(s: str):
         s = _normalize(s)
@@ -97,53 +130,43 @@ def extract_qualifications_from_bullets(bullets: Sequence[str]) -> list[dict]:
             return
         if "base salary" in s.lower() or "benefits" in s.lower() or "vacation" in s.lower():
             return
+        tid = term_id(s)
         # Drop list-artifact fragments
-        if s.lower().startswith("in ") or s.lower() in ("a related field", "or a related field"):
+        if tid is None and (s.lower().startswith("in ") or is_fragment(s)):
             return
         key = s.lower()
         if key in seen:
             return
         seen.add(key)
-        result.append({"qualification": s, "category": _category_qualification(s)})
+        result.append({"qualification": s, "category": _category_qualification(s), "term_id": tid})
 
-    for bullet in bullets:
+    for index, bullet in enumerate(bullets):
         if not bullet:
             continue
-        text = bullet
-        if "estimated base salary" in text.lower() or "benefits package" in text.lower():
+        if "estimated base salary" in bullet.lower() or "benefits package" in bullet.lower():
             continue
+        text = budget.start(index, bullet) if budget else bullet
 
-        # 1) Degrees
-        for d in DEGREES:
-            if re.search(rf"\b{re.escape(d)}\b", text, re.I):
-                add(d)
-
-        # 2) Fields (degree in X, Y, or Z)
-        for f in FIELDS:
-            if re.search(rf"\b{re.escape(f)}\b", text, re.I):
-                add(f)
-
-        # 3) Soft skills
-        for ss in SOFT_SKILLS:
-            if ss in text.lower():
-                add(ss)
-
-        # 4) Tech from qualifications (LANGUAGES, TOOLS, QUALIFICATION_TECH, etc.)
-        all_tech = LANGUAGES | TOOLS | QUALIFICATION_TECH
-        for tech in all_tech:
-            if re.search(rf"\b{re.escape(tech)}\b", text, re.I):
-                add(tech)
+        # 1-4) Degrees, fields, soft skills and tech (whole-word, one pass)
+        for _, _, tid in QUALIFICATION_TRIE.scan(text, stop=lexicon_stop):
+            add(TERMS[tid])
+        if budget and budget.expired("lexicon"):
+            continue
 
         # 5) "Experience working with X or Y" / "degree in X, Y, or Z"
-        for pat in LIST_PATTERNS:
-            for m in pat.finditer(text):
-                phrase = m.group(1).strip()
-                phrase = re.split(r"\s+is\s+|\s+to\s+|\s+for\s+", phrase, maxsplit=1)[0].strip()
-                for token in _split_list_phrase(phrase):
-                    if len(token) < 2 or len(token) > 60:
-                        continue
-                    if token.lower() in ("e.g", "etc", "and", "or", "such as", "related"):
-                        continue
-                    add(token)
+        if budget:
+            phrases = iter_list_phrases(text, BOUNDED_LIST_TRIGGERS)
+        else:
+            phrases = _iter_list_phrases(text)
+        for phrase in phrases:
+            if budget and budget.expired("list_patterns"):
+                break
+            phrase = re.split(r"\s+is\s+|\s+to\s+|\s+for\s+", phrase, maxsplit=1)[0].strip()
+            for token in _split_list_phrase(phrase):
+                if len(token) < 2 or len(token) > 60:
+                    continue
+                if token.lower() in ("e.g", "etc", "and", "or", "such as", "related"):
+                    continue
+                add(token)
 
     return result
@@ -0,0 +1,400 @@
+"""
+Record-and-replay harness for offline, reproducible pipeline runs.
+
+record: run the crawl through a RecordingSession and save every HTTP response
+        (HRT AJAX, OpenAlex works pages) into a gzipped JSON-lines fixture archive.
+replay: serve an archive from a local stub HTTP server, with optional latency,
+        error-rate and bandwidth injection, and run crawl -> parse -> extract ->
+        write (plus the OpenAlex works pull) against it, reporting per-stage
+        timings, throughput and latency.
+
+The pipeline itself never retries, so with the default --retries 0 injected
+errors only show up as failed runs. --retries N lets ReplaySession retry 5xx
+answers N times with backoff, measuring how the run recovers instead.
+
+    python replay.py record fixtures/hrt.jsonl.gz --topic T10054
+    python replay.py replay fixtures/hrt.jsonl.gz --runs 10 --latency 0.05 --error-rate 0.05 --bandwidth 250000
+    python replay.py replay fixtures/hrt.jsonl.gz --error-rate 0.3 --retries 3
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Sequence
+from urllib.parse import urlsplit
+
+import requests
+
+from jobs_cursor import HRTCompany, build_tables, write_csv_tables
+from openalex import BASE_URL, iter_topic_works, write_works_csv
+
+# OpenAlex topics pulled when recording without --topic
+DEFAULT_OPENALEX_TOPICS = ["T10054"]
+
+_TOPIC_FILTER = re.compile(r"primary_topic\.id:([^,&]+)")
+
+
+def _body_digest(body: bytes | str | None) -> str:
+    if body is None:
+        body = b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return hashlib.sha1(body).hexdigest()
+
+
+def _key(method: str, url: str, body: bytes | str | None) -> str:
+    return f"{method.upper()} {url} {_body_digest(body)}"
+
+
+# ---------------------------------------------------------------------------
+# Fixture archive: one JSON object per recorded response
+# ---------------------------------------------------------------------------
+
+def load_archive(path: str) -> dict[str, dict]:
+    """Read an archive into {request key: entry}. Later entries win."""
+    entries = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entries[entry["key"]] = entry
+    return entries
+
+
+def archived_topics(archive: dict[str, dict]) -> list[str]:
+    """OpenAlex topic ids whose works pages were recorded in an archive."""
+    topics = set()
+    for entry in archive.values():
+        if entry["url"].startswith(BASE_URL):
+            topics.update(_TOPIC_FILTER.findall(entry["url"]))
+    return sorted(topics)
+
+
+class RecordingSession(requests.Session):
+    """requests.Session that appends every response it receives to an archive."""
+
+    def __init__(self, archive_path: str):
+        super().__init__()
+        self.archive_path = archive_path
+        self.recorded = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(archive_path) or ".", exist_ok=True)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response = super().send(request, **kwargs)
+        entry = {
+            "key": _key(request.method, request.url, request.body),
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", "application/octet-stream"),
+            "content": base64.b64encode(response.content).decode("ascii"),
+        }
+        with self._lock, gzip.open(self.archive_path, "at", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            self.recorded += 1
+        return response
+
+
+# ---------------------------------------------------------------------------
+# Stub server
+# ---------------------------------------------------------------------------
+
+class StubServer:
+    """
+    Local HTTP server replaying an archive. Requests arrive as
+    http://127.0.0.1:<port>/<scheme>/<host>/<path>?<query> (see ReplaySession).
+
+    latency: seconds added before each response
+    error_rate: probability of answering 503 instead of the recording
+    bandwidth: bytes/second cap on response bodies (None = unlimited)
+    """
+
+    CHUNK = 16 * 1024
+
+    def __init__(
+        self,
+        archive: dict[str, dict],
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        bandwidth: float | None = None,
+        seed: int | None = None,
+    ):
+        self.archive = archive
+        self.latency = latency
+        self.error_rate = error_rate
+        self.bandwidth = bandwidth
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.served = 0
+        self.errors = 0
+        self.misses = 0
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _inject_error(self) -> bool:
+        with self._rng_lock:
+            return self._rng.random() < self.error_rate
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else None
+                scheme, _, rest = self.path.lstrip("/").partition("/")
+                entry = stub.archive.get(_key(self.command, f"{scheme}://{rest}", body))
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if entry is None:
+                    stub.misses += 1
+                    self._send(404, "text/plain", f"no recording for {self.command} {scheme}://{rest}".encode())
+                    return
+                if stub.error_rate and stub._inject_error():
+                    stub.errors += 1
+                    self._send(503, "text/plain", b"injected error")
+                    return
+                stub.served += 1
+                self._send(entry["status"], entry["content_type"], base64.b64decode(entry["content"]))
+
+            def _send(self, status: int, content_type: str, content: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if not stub.bandwidth:
+                    self.wfile.write(content)
+                    return
+                for i in range(0, len(content), stub.CHUNK):
+                    chunk = content[i:i + stub.CHUNK]
+                    self.wfile.write(chunk)
+                    time.sleep(len(chunk) / stub.bandwidth)
+
+            do_GET = _reply
+            do_POST = _reply
+
+        return Handler
+
+    def __enter__(self) -> "StubServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class ReplaySession(requests.Session):
+    """
+    requests.Session that sends every request to a StubServer and times it.
+    5xx answers are retried up to `retries` times with exponential backoff
+    starting at `backoff` seconds; each attempt's latency is recorded.
+    """
+
+    def __init__(self, base_url: str, retries: int = 0, backoff: float = 0.01):
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self.backoff = backoff
+        self.latencies: list[float] = []
+        self.bytes_received = 0
+        self.retried = 0
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        parts = urlsplit(url)
+        rewritten = f"{self.base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+        if parts.query:
+            rewritten += f"?{parts.query}"
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            response = super().request(method, rewritten, *args, **kwargs)
+            self.latencies.append(time.perf_counter() - start)
+            self.bytes_received += len(response.content)
+            if response.status_code < 500 or attempt == self.retries:
+                return response
+            self.retried += 1
+            time.sleep(self.backoff * 2 ** attempt)
+
+
+# ---------------------------------------------------------------------------
+# End-to-end run
+# ---------------------------------------------------------------------------
+
+def run_pipeline(
+    session: requests.Session,
+    out_dir: str,
+    bounded: bool = True,
+    openalex_topics: Sequence[str] = (),
+) -> dict:
+    """
+    crawl -> parse -> extract -> write once with the given session, then pull
+    the OpenAlex works of openalex_topics into works.csv (if any).
+    Returns {"jobs": n, "works": n, "crawl"/"parse"/"extract"/"write"/"openalex"/"total": seconds}.
+    """
+    timings = {"crawl": 0.0, "parse": 0.0}
+    all_jobs = []
+    start = time.perf_counter()
+    for company in [HRTCompany(session=session)]:
+        t = time.perf_counter()
+        raw_list = company.fetch_raw_jobs()
+        timings["crawl"] += time.perf_counter() - t
+
+        t = time.perf_counter()
+        all_jobs.extend(company.parse_jobs(raw_list))
+        timings["parse"] += time.perf_counter() - t
+
+    t = time.perf_counter()
+    tables = build_tables(all_jobs, bounded=bounded)
+    timings["extract"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    write_csv_tables(tables, {name: os.path.join(out_dir, f"{name}.csv") for name in tables})
+    timings["write"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    timings["works"] = (
+        write_works_csv(iter_topic_works(openalex_topics, session=session), os.path.join(out_dir, "works.csv"))
+        if openalex_topics else 0
+    )
+    timings["openalex"] = time.perf_counter() - t
+
+    timings["total"] = time.perf_counter() - start
+    timings["jobs"] = len(all_jobs)
+    return timings
+
+
+def _pct(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def replay(
+    archive_path: str,
+    runs: int = 5,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    bandwidth: float | None = None,
+    seed: int | None = 0,
+    bounded: bool = True,
+    openalex_topics: Sequence[str] | None = None,
+    retries: int = 0,
+) -> dict:
+    """
+    Replay an archive `runs` times against a StubServer and print a report.
+    openalex_topics defaults to every topic recorded in the archive; retries
+    is passed to ReplaySession.
+    """
+    archive = load_archive(archive_path)
+    if openalex_topics is None:
+        openalex_topics = archived_topics(archive)
+    results = []
+    failures = 0
+    with StubServer(archive, latency, error_rate, bandwidth, seed) as stub, \
+            tempfile.TemporaryDirectory() as out_dir:
+        session = ReplaySession(stub.base_url, retries=retries)
+        for _ in range(runs):
+            try:
+                results.append(run_pipeline(session, out_dir, bounded=bounded, openalex_topics=openalex_topics))
+            except Exception as e:
+                failures += 1
+                print(f"run failed: {e}")
+
+    totals = [r["total"] for r in results]
+    jobs = sum(r["jobs"] for r in results)
+    report = {
+        "runs": runs,
+        "failed_runs": failures,
+        "jobs_per_run": results[0]["jobs"] if results else 0,
+        "works_per_run": results[0]["works"] if results else 0,
+        "jobs_per_second": jobs / sum(totals) if totals else 0.0,
+        "requests": len(session.latencies),
+        "injected_errors": stub.errors,
+        "retried_requests": session.retried,
+        "retries_per_request": retries,
+        "unrecorded_requests": stub.misses,
+        "bytes_received": session.bytes_received,
+        "request_latency_ms": {
+            "p50": _pct(session.latencies, 0.50) * 1e3,
+            "p95": _pct(session.latencies, 0.95) * 1e3,
+            "max": max(session.latencies, default=0.0) * 1e3,
+        },
+        "run_latency_ms": {"p50": _pct(totals, 0.50) * 1e3, "p95": _pct(totals, 0.95) * 1e3},
+        "stage_mean_ms": {
+            stage: statistics.mean(r[stage] for r in results) * 1e3 if results else 0.0
+            for stage in ("crawl", "parse", "extract", "write", "openalex")
+        },
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+def record(archive_path: str, openalex_topics: Sequence[str] = DEFAULT_OPENALEX_TOPICS) -> None:
+    """Run the live crawl and OpenAlex pull once through a RecordingSession."""
+    session = RecordingSession(archive_path)
+    with tempfile.TemporaryDirectory() as out_dir:
+        timings = run_pipeline(session, out_dir, openalex_topics=openalex_topics)
+    print(
+        f"Recorded {session.recorded} responses ({timings['jobs']} jobs, "
+        f"{timings['works']} works) to {archive_path}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or replay pipeline HTTP traffic.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    rec = sub.add_parser("record", help="crawl live and save responses")
+    rec.add_argument("archive")
+    rec.add_argument("--topic", action="append", help="OpenAlex topic id to pull (repeatable)")
+
+    rep = sub.add_parser("replay", help="run the pipeline against a local stub server")
+    rep.add_argument("archive")
+    rep.add_argument("--runs", type=int, default=5)
+    rep.add_argument("--latency", type=float, default=0.0, help="seconds added per response")
+    rep.add_argument("--error-rate", type=float, default=0.0, help="fraction of responses answered 503")
+    rep.add_argument("--bandwidth", type=float, default=None, help="response bytes/second cap")
+    rep.add_argument("--seed", type=int, default=0)
+    rep.add_argument("--topic", action="append", help="OpenAlex topic id (default: those in the archive)")
+    rep.add_argument("--retries", type=int, default=0, help="retries per request on 5xx (0 = pipeline behaviour)")
+    rep.add_argument("--unbounded", action="store_true", help="run extractors without the per-bullet budget")
+
+    args = parser.parse_args()
+    if args.mode == "record":
+        record(args.archive, args.topic or DEFAULT_OPENALEX_TOPICS)
+    else:
+        replay(
+            args.archive,
+            runs=args.runs,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            bandwidth=args.bandwidth,
+            seed=args.seed,
+            bounded=not args.unbounded,
+            openalex_topics=args.topic,
+            retries=args.retries,
+        )
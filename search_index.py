@@ -0,0 +1,188 @@
+"""
+Full-text search over job descriptions.
+
+Descriptions are stored in a SQLite database (data/search.db) with an FTS5
+inverted index kept in sync by triggers, so postings are updated
+incrementally as jobs are re-crawled. The index is an archive: postings that
+leave the board stay searchable, flagged inactive. Every posting carries the
+job id and crawl date of the latest crawl it was seen in (job ids are
+renumbered on every run; the pair identifies the row in that crawl's jobs
+table / columnar partition). Results are ranked with BM25 (title weighted
+above description). Quoted parts of a query are phrase queries.
+
+    python search_index.py 'low-latency FPGA "market data"'
+"""
+
+import re
+import sqlite3
+import sys
+from datetime import date
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    rowid INTEGER PRIMARY KEY,
+    url TEXT UNIQUE NOT NULL,
+    job_id INTEGER,
+    crawl_date TEXT,
+    active INTEGER NOT NULL DEFAULT 1,
+    company TEXT,
+    title TEXT,
+    description TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+    title, description, content='postings', content_rowid='rowid',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS postings_ai AFTER INSERT ON postings BEGIN
+    INSERT INTO postings_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_ad AFTER DELETE ON postings BEGIN
+    INSERT INTO postings_fts(postings_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_au AFTER UPDATE OF title, description ON postings
+WHEN old.title IS NOT new.title OR old.description IS NOT new.description BEGIN
+    INSERT INTO postings_fts(postings_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO postings_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+"""
+
+# BM25 column weights: (title, description)
+BM25_WEIGHTS = (5.0, 1.0)
+
+_PHRASE = re.compile(r'"([^"]*)"')
+_TOKEN = re.compile(r"\w+")
+
+
+def to_fts_query(query: str, mode: str = "or") -> str:
+    """
+    Turn a free-text query into an FTS5 MATCH expression. "quoted text" and
+    hyphenated words ("low-latency") become phrases; everything else is a
+    quoted term, so user input can't inject FTS syntax.
+    """
+    if mode not in ("or", "and"):
+        raise ValueError(f"unknown mode: {mode}")
+    clauses = []
+    for phrase in _PHRASE.findall(query):
+        tokens = _TOKEN.findall(phrase)
+        if tokens:
+            clauses.append('"' + " ".join(tokens) + '"')
+    for chunk in _PHRASE.sub(" ", query).split():
+        tokens = _TOKEN.findall(chunk)
+        if tokens:
+            clauses.append('"' + " ".join(tokens) + '"')
+    return f" {mode.upper()} ".join(clauses)
+
+
+class JobSearchIndex:
+    def __init__(self, path: str = "data/search.db"):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "JobSearchIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def add_jobs(
+        self,
+        jobs: list[dict],
+        job_rows: list[dict],
+        crawl_date: str | None = None,
+        companies: list[str] | None = None,
+    ) -> int:
+        """
+        Index parsed jobs (with "description") against their rows in the jobs
+        table (same order, as returned by jobs_cursor.build_tables). Postings
+        are keyed by url: unchanged ones are left alone, changed ones are
+        re-indexed, and all get this crawl's job id and crawl_date and are
+        marked active. Postings of `companies` (default: every company in
+        job_rows) that are missing from this crawl are marked inactive but kept,
+        still pointing at the crawl they were last seen in. Returns the number
+        of postings whose title or description was added or changed.
+        """
+        crawl_date = crawl_date or date.today().isoformat()
+        if companies is None:
+            companies = sorted({row["company"] for row in job_rows})
+        changed = 0
+        with self.conn:
+            for job, row in zip(jobs, job_rows):
+                # Content upsert: rowcount is 0 when title and description are unchanged
+                changed += self.conn.execute(
+                    """
+                    INSERT INTO postings (url, job_id, crawl_date, company, title, description)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        company = excluded.company,
+                        title = excluded.title,
+                        description = excluded.description
+                    WHERE postings.title IS NOT excluded.title
+                       OR postings.description IS NOT excluded.description
+                    """,
+                    (row["url"], row["id"], crawl_date, row["company"], row["title"], job.get("description") or ""),
+                ).rowcount
+                # Re-link to this crawl's job id (doesn't touch the FTS index)
+                self.conn.execute(
+                    "UPDATE postings SET job_id = ?, crawl_date = ?, active = 1 WHERE url = ?",
+                    (row["id"], crawl_date, row["url"]),
+                )
+            seen = {row["url"] for row in job_rows}
+            for company in companies:
+                gone = [
+                    (url,)
+                    for (url,) in self.conn.execute(
+                        "SELECT url FROM postings WHERE company = ? AND active", (company,)
+                    )
+                    if url not in seen
+                ]
+                self.conn.executemany("UPDATE postings SET active = 0 WHERE url = ?", gone)
+        return changed
+
+    def remove(self, urls: list[str]) -> None:
+        """Delete postings from the archive entirely."""
+        with self.conn:
+            self.conn.executemany("DELETE FROM postings WHERE url = ?", [(u,) for u in urls])
+
+    def search(self, query: str, limit: int = 20, mode: str = "or", active_only: bool = False) -> list[dict]:
+        """
+        BM25-ranked postings for a query, best first, across the whole archive
+        (active_only=True: only postings on the board at their last crawl).
+        Returns {"job_id", "crawl_date", "active", "company", "title", "url",
+        "score", "snippet"} dicts.
+        """
+        match = to_fts_query(query, mode)
+        if not match:
+            return []
+        rows = self.conn.execute(
+            """
+            SELECT p.job_id, p.crawl_date, p.active, p.company, p.title, p.url,
+                   -bm25(postings_fts, ?, ?) AS score,
+                   snippet(postings_fts, 1, '[', ']', '...', 16)
+            FROM postings_fts JOIN postings p ON p.rowid = postings_fts.rowid
+            WHERE postings_fts MATCH ? AND (p.active OR NOT ?)
+            ORDER BY score DESC
+            LIMIT ?
+            """,
+            (*BM25_WEIGHTS, match, active_only, limit),
+        ).fetchall()
+        keys = ("job_id", "crawl_date", "active", "company", "title", "url", "score", "snippet")
+        return [dict(zip(keys, r)) for r in rows]
+
+    def optimize(self) -> None:
+        """Merge FTS segments after many incremental updates."""
+        with self.conn:
+            self.conn.execute("INSERT INTO postings_fts(postings_fts) VALUES ('optimize')")
+
+
+if __name__ == "__main__":
+    with JobSearchIndex() as index:
+        for hit in index.search(" ".join(sys.argv[1:])):
+            status = "" if hit["active"] else "  (no longer listed)"
+            print(f"{hit['score']:7.2f}  [{hit['crawl_date']} #{hit['job_id']}] {hit['company']} | {hit['title']} | {hit['url']}{status}")
+            print(f"         {hit['snippet']}")
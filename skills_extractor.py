@@ -9,8 +9,18 @@ languages, clouds, vendors, and high-level categories.
 import re
 from typing import Sequence
 
+from bounded_scan import (
+    DEFAULT_MAX_BULLET_CHARS,
+    DEFAULT_MAX_BULLET_SECONDS,
+    PARENTHESES,
+    BulletBudget,
+    iter_list_phrases,
+)
+from canonical_terms import TERMS, TermTrie, canonical, is_fragment, term_id
+
 # ---------------------------------------------------------------------------
-# Skill lexicons: normalized name -> category (for matching in prose)
+# Skill lexicons: canonical name -> category (for matching in prose).
+# Aliases ("Google Cloud", "Unix") live in canonical_terms.ALIASES.
 # ---------------------------------------------------------------------------
 
 PROTOCOLS = {
@@ -20,7 +30,7 @@ PROTOCOLS = {
 
 TOOLS = {
     "tcpdump", "Wireshark", "Ansible", "Salt", "Prometheus", "Grafana",
-    "ELK", "GitHub", "Git", "Wireshark", "pcap",
+    "ELK", "GitHub", "Git", "pcap",
 }
 
 LANGUAGES = {
@@ -29,12 +39,12 @@ LANGUAGES = {
 }
 
 CLOUDS = {
-    "AWS", "GCP", "Azure", "GCP", "Google Cloud", "Azure",
+    "AWS", "GCP", "Azure",
 }
 
 VENDORS_PLATFORMS = {
     "Arista", "EOS", "Cisco", "NX-OS", "Nvidia", "Cumulus", "SONiC",
-    "Juniper", "Linux", "Unix",
+    "Juniper", "Linux",
 }
 
 # Combined set for "mentioned in text" lookup (lowercase for matching)
@@ -46,9 +56,12 @@ ALL_KNOWN_SKILLS = (
     | {s.lower() for s in VENDORS_PLATFORMS}
 )
 
+# All lexicon terms and their aliases, for one-pass matching
+SKILL_TRIE = TermTrie(PROTOCOLS | TOOLS | LANGUAGES | CLOUDS | VENDORS_PLATFORMS)
+
 
 def _normalize(s: str) -> str:
-    return s.strip()
+    return canonical(s.strip())
 
 
 def _category(s: str) -> str:
@@ -78,6 +91,14 @@ LIST_PATTERNS = [
     re.compile(r"\bincluding\s+([^.]+?)(?:\.|$)", re.I),
 ]
 
+# Same lists for bounded mode: fixed-width triggers, phrases cut by bounded_scan
+BOUNDED_LIST_TRIGGERS = [
+    re.compile(r"\bsuch as\s", re.I),
+    PARENTHESES,
+    re.compile(r"\be\.g\.\s?", re.I),
+    re.compile(r"\bincluding\s", re.I),
+]
+
 
 def _split_list_phrase(phrase: str) -> list[str]:
     """Split a phrase like 'X, Y, and Z' or 'X, Y or Z' into tokens."""
@@ -89,53 +110,75 @@ def _split_list_phrase(phrase: str) -> list[str]:
     return parts
 
 
-def extract_skills_from_bullets(bullets: Sequence[str]) -> list[dict]:
+def _iter_list_phrases(text: str) -> list[str]:
+    return [m.group(1).strip() for pat in LIST_PATTERNS for m in pat.finditer(text)]
+
+
+def extract_skills_from_bullets(
+    bullets: Sequence[str],
+    bounded: bool = False,
+    max_bullet_chars: int = DEFAULT_MAX_BULLET_CHARS,
+    max_bullet_seconds: float = DEFAULT_MAX_BULLET_SECONDS,
+    truncations: list[dict] | None = None,
+) -> list[dict]:
     """
     From a list of skill bullets (long prose strings), extract distinctive
-    skill tokens with category. Returns list of {"skill": str, "category": str}.
+    skill tokens with category. Returns list of
+    {"skill": str, "category": str, "term_id": int | None}, where skill is the
+    canonical term and term_id its id in canonical_terms (None for tokens
+    outside the lexicons).
+
+    bounded=True switches to linear-time list scanning (bounded_scan) and clips
+    each bullet to max_bullet_chars / max_bullet_seconds; anything cut short is
+    appended to `truncations` (see bounded_scan.BulletBudget).
     """
     seen = set()
     result: list[dict] = []
+    budget = BulletBudget(max_bullet_chars, max_bullet_seconds, truncations) if bounded else None
+    lexicon_stop = (lambda: budget.expired("lexicon")) if budget else None
 
     def add(s: str):
         s = _normalize(s)
         if not s or len(s) > 80:
             return
+        tid = term_id(s)
+        if tid is None and is_fragment(s):
+            return
         key = s.lower()
         if key in seen:
             return
         seen.add(key)
-        result.append({"skill": s, "category": _category(s)})
+        result.append({"skill": s, "category": _category(s), "term_id": tid})
 
-    for bullet in bullets:
+    for index, bullet in enumerate(bullets):
         if not bullet or "base salary" in bullet.lower():
             continue
-        text = bullet
+        text = budget.start(index, bullet) if budget else bullet
 
-        # 1) Mentioned known skills (whole-word)
-        for skill in PROTOCOLS | TOOLS | LANGUAGES | CLOUDS | VENDORS_PLATFORMS:
-            if skill in {"GCP", "Google Cloud"} and "Google Cloud" in text and "GCP" not in text:
-                add("GCP")
-                continue
-            # Prefer whole-word or immediately after punctuation
-            if re.search(rf"\b{re.escape(skill)}\b", text, re.I):
-                add(skill)
+        # 1) Mentioned known skills and aliases (whole-word, one pass)
+        for _, _, tid in SKILL_TRIE.scan(text, stop=lexicon_stop):
+            add(TERMS[tid])
+
+        if budget and budget.expired("lexicon"):
+            continue
 
         # 2) Listed items from patterns
-        for pat in LIST_PATTERNS:
-            for m in pat.finditer(text):
-                phrase = m.group(1).strip()
-                # Trim trailing sentence (e.g. "Ansible or Salt is desirable...")
-                phrase = re.split(r"\s+is\s+|\s+to\s+support\s+|\s+for\s+", phrase, maxsplit=1)[0].strip()
-                for token in _split_list_phrase(phrase):
-                    # Filter to likely skills: not pure sentence fragments
-                    if any(c.isdigit() for c in token) and len(token) < 4:
-                        continue
-                    if token.lower() in ("e.g", "etc", "and", "or", "such as"):
-                        continue
-                    if re.search(r"\b(is|to|for|with|in|and|or)\b", token, re.I) and len(token) > 25:
-                        continue
-                    add(token)
+        if budget:
+            phrases = iter_list_phrases(text, BOUNDED_LIST_TRIGGERS)
+        else:
+            phrases = _iter_list_phrases(text)
+        for phrase in phrases:
+            if budget and budget.expired("list_patterns"):
+                break
+            # Trim trailing sentence (e.g. "Ansible or Salt is desirable...")
+            phrase = re.split(r"\s+is\s+|\s+to\s+support\s+|\s+for\s+", phrase, maxsplit=1)[0].strip()
+            for token in _split_list_phrase(phrase):
+                # Filter to likely skills: not pure sentence fragments
+                if any(c.isdigit() for c in token) and len(token) < 4:
+                    continue
+                if token.lower() in ("e.g", "etc", "and", "or", "such as"):
+                    continue
+                add(token)
 
     return result
 